@@ -1,97 +1,72 @@
+import os
 import sys
 import json
 
-# Função para carregar a definição do autômato de um arquivo JSON
-def load_afd_from_json(file_path):
-    with open(file_path, 'r') as file:
-        afd_definition = json.load(file)
-    return afd_definition
-
-
-# Função para imprimir o digraph do autômato
-def print_digraph(afd_definition):
-    print("digraph {")
-    # Define os estados finais como estados duplamente circulares
-    print("node [shape = doublecircle]; " + ', '.join(afd_definition["F"]) + ";")
-     # Define o estado inicial como um ponto
-    print("node [shape = point]; initial;")
-    # Define os estados restantes como círculos
-    print("node [shape = circle];")
-    # Define a transição do estado inicial
-    print("initial->" + afd_definition["q0"] + ";")
-    # Define as transições entre os estados
-    for state, transitions in afd_definition["delta"].items():
-        for symbol, next_state in transitions.items():
-            print(state + "->" + next_state + "[label=\"" + symbol + "\"];")
-    print("}")
-
-
-# Função para reconhecer uma palavra no autômato
-def recognize_word(afd_definition, word):
-    current_state = afd_definition["q0"]
-    path = [current_state]
-    for symbol in word:
-        if symbol not in afd_definition["V"]:
-            return False, ["símbolo '" + symbol + "' não pertence ao alfabeto"]
-        if symbol not in afd_definition["delta"][current_state]:
-            return False, ["não há transição do estado '" + current_state + "' com o símbolo '" + symbol + "'"]
-        next_state = afd_definition["delta"][current_state][symbol]
-        path.append(symbol + "->" + next_state)
-        current_state = next_state
-    if current_state in afd_definition["F"]:
-        return True, path
+# Permite importar o pacote automatos, que está na pasta acima desta
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from automatos.afd import load_afd_from_json, validate_afd_definition
+from automatos.afd_compilado import compile_afd, recognize_compiled
+from automatos.estatisticas import count, enable_stats_from_argv, phase
+
+
+def main(argv):
+    # Verifica se há argumentos suficientes
+    if len(argv) < 3:
+        print("Usage: python afd-main.py <arquivo.json|arquivo.afdb> [-graphviz [-depth <k>] [-top <n>]] [-rec '<palavra>'] [-batch <palavras.txt|-> [-reason] [-workers <n>] [-chunk <bytes>] [-vector]] [-export-bin <arquivo.afdb>] [-export-json <arquivo.json>] [--stats|--stats=json]")
+        sys.exit(1)
+
+    # Liga a instrumentação (tempos, contadores e memória), se a opção --stats estiver presente
+    enable_stats_from_argv(argv)
+
+    file_path = argv[1]
+    if file_path.endswith(".afdb"):
+        from automatos.binario import afd_from_compiled, load_binary
+        # Carrega o autômato já compilado do arquivo binário (mapeado em memória, sem validação)
+        with phase("load_binary"):
+            compiled = load_binary(file_path)
+        afd_definition = afd_from_compiled(compiled) if "-export-json" in argv else None
     else:
-        return False, ["o estado '" + current_state + "' não é final"]
-
-
-# Função para validar a definição do autômato
-def validate_afd_definition(afd_definition):
-    # Verificar se todos os estados definidos em Q estão presentes nas transições
-    for state in afd_definition["Q"]:
-        if state not in afd_definition["delta"]:
-            raise ValueError("O estado '" + state + "' definido em Q não está presente nas transições delta.")
-
-    # Verificar se o estado inicial (q0) está presente na definição
-    if afd_definition["q0"] not in afd_definition["Q"]:
-        raise ValueError("O estado inicial 'q0' não está presente na definição dos estados Q.")
-
-    # Verificar se todos os estados finais (F) estão presentes na definição
-    for final_state in afd_definition["F"]:
-        if final_state not in afd_definition["Q"]:
-            raise ValueError("O estado final '" + final_state + "' não está presente na definição dos estados Q.")
-
-    # Verificar se todas as transições do delta correspondem a estados e símbolos válidos
-    for state, transitions in afd_definition["delta"].items():
-        if state not in afd_definition["Q"]:
-            raise ValueError("O estado '" + state + "' nas transições delta não está presente na definição dos estados Q.")
-        for symbol, next_state in transitions.items():
-            if symbol not in afd_definition["V"]:
-                raise ValueError("O símbolo '" + symbol + "' nas transições delta não está presente no alfabeto V.")
-            if next_state not in afd_definition["Q"]:
-                raise ValueError("O estado '" + next_state + "' nas transições delta não está presente na definição dos estados Q.")
-
-
-# Verifica se há argumentos suficientes
-if len(sys.argv) < 3:
-    print("Usage: python afd-main.py <arquivo.json> [-graphviz] [-rec '<palavra>']")
-    sys.exit(1)
-
-# Carrega a definição do autômato do arquivo JSON
-file_path = sys.argv[1]
-afd_definition = load_afd_from_json(file_path)
-
-# Valida a definição do autômato
-validate_afd_definition(afd_definition)
-
-# Imprime o digraph do autômato, se a opção -graphviz estiver presente
-if "-graphviz" in sys.argv:
-        print_digraph(afd_definition)
-
-# Reconhece a palavra fornecida, se a opção -rec estiver presente
-if "-rec" in sys.argv:
-        word_index = sys.argv.index("-rec") + 1
-        word = sys.argv[word_index]
-        recognized, path = recognize_word(afd_definition, word)
+        # Carrega a definição do autômato do arquivo JSON
+        with phase("json_load"):
+            afd_definition = load_afd_from_json(file_path)
+
+        # Valida a definição do autômato
+        with phase("validate"):
+            validate_afd_definition(afd_definition)
+
+        # Compila o autômato numa tabela de transições
+        with phase("compile"):
+            compiled = compile_afd(afd_definition)
+    count("states", len(compiled["states"]))
+
+    # Imprime o digraph do autômato, se a opção -graphviz estiver presente.
+    # Com -depth k, apenas os estados a no máximo k passos de q0; com -top n, apenas os n estados com mais transições.
+    if "-graphviz" in argv:
+        from automatos.graphviz import write_afd_dot
+        depth = int(argv[argv.index("-depth") + 1]) if "-depth" in argv else None
+        top = int(argv[argv.index("-top") + 1]) if "-top" in argv else None
+        with phase("graphviz"):
+            write_afd_dot(compiled, sys.stdout, depth, top)
+
+    # Exporta o autômato no formato binário, se a opção -export-bin estiver presente
+    if "-export-bin" in argv:
+        from automatos.binario import write_binary
+        with phase("export_binary"):
+            write_binary(compiled, argv[argv.index("-export-bin") + 1])
+
+    # Exporta o autômato no formato JSON, se a opção -export-json estiver presente
+    if "-export-json" in argv:
+        with phase("export_json"):
+            with open(argv[argv.index("-export-json") + 1], 'w') as file:
+                json.dump(afd_definition, file, indent=4)
+
+    # Reconhece a palavra fornecida, se a opção -rec estiver presente
+    if "-rec" in argv:
+        word_index = argv.index("-rec") + 1
+        word = argv[word_index]
+        with phase("recognize"):
+            recognized, path = recognize_compiled(compiled, word)
+        count("words_processed")
         if recognized:
             print("'" + word + "' é reconhecida")
             print("[caminho " + "->".join(path) + "]")
@@ -99,3 +74,34 @@ if "-rec" in sys.argv:
             print("'" + word + "' não é reconhecida")
             for error in path:
                 print("[" + error + "]")
+
+    # Reconhece as palavras de um arquivo (uma por linha), se a opção -batch estiver presente
+    if "-batch" in argv:
+        batch_index = argv.index("-batch") + 1
+        words_path = argv[batch_index]
+        with_reason = "-reason" in argv
+        with phase("recognize_batch"):
+            # Com a opção -vector, as palavras são reconhecidas em lotes com o NumPy
+            if "-vector" in argv:
+                try:
+                    from automatos.vetorizado import recognize_file_vectorized
+                except ImportError as error:
+                    print("Erro: " + str(error))
+                    sys.exit(1)
+                processed = recognize_file_vectorized(compiled, words_path, with_reason=with_reason)
+            # Com a opção -workers, o arquivo é dividido em pedaços reconhecidos por vários processos
+            elif "-workers" in argv and words_path != "-":
+                from automatos.afd_paralelo import DEFAULT_CHUNK_SIZE, recognize_file_parallel
+                workers = int(argv[argv.index("-workers") + 1])
+                chunk_size = DEFAULT_CHUNK_SIZE
+                if "-chunk" in argv:
+                    chunk_size = int(argv[argv.index("-chunk") + 1])
+                processed = recognize_file_parallel(compiled, words_path, with_reason=with_reason, workers=workers, chunk_size=chunk_size)
+            else:
+                from automatos.afd_lote import recognize_file
+                processed = recognize_file(compiled, words_path, with_reason=with_reason)
+        count("words_processed", processed)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
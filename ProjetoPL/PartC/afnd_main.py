@@ -1,140 +1,18 @@
+import os
 import sys
 import json
 
-# Função para converter um AFND em um AFD
-def convert_afnd_to_afd(afnd):
-    # Obtendo informações do AFND
-    afnd_states = afnd['Q']  # Conjunto de estados do AFND
-    afnd_alphabet = afnd['V']  # Alfabeto do AFND
-    afnd_delta = afnd['delta']  # Função de transição do AFND
-    afnd_initial_state = afnd['q0'] if isinstance(afnd['q0'], str) else afnd['q0'][0]  # Estado inicial do AFND
-    afnd_final_states = afnd['F']  # Conjunto de estados finais do AFND
-
-    # Função para calcular o fecho-épsilon de um conjunto de estados
-    def epsilon_closure(states):
-        closure = set(states)
-        stack = list(states)
-        # Itera até que a pilha esteja vazia
-        while stack:
-            state = stack.pop()
-            # Verifica se existe transição epsilon a partir do estado atual
-            if 'epsilon' in afnd_delta[state]:
-                for epsilon_state in afnd_delta[state]['epsilon']:
-                    if epsilon_state not in closure:
-                        closure.add(epsilon_state)
-                        stack.append(epsilon_state)
-        return tuple(sorted(closure))  # Convertendo para tuple para tornar os conjuntos hashable
-
-    # Função para calcular a transição de um conjunto de estados dado um símbolo de entrada
-    def transition(states, symbol):
-        result = set()
-        # Itera sobre os estados atuais
-        for state in states:
-            # Verifica se existe transição para o símbolo atual
-            if symbol in afnd_delta[state]:
-                result.update(afnd_delta[state][symbol])
-        return result
-
-    # Inicializando variáveis para o AFD
-    afd_states = []  # Conjunto de estados do AFD
-    afd_delta = {}  # Função de transição do AFD
-    afd_final_states = []  # Conjunto de estados finais do AFD
-    unprocessed_states = [epsilon_closure([afnd_initial_state])]  # Estados a serem processados
-    processed_states = []  # Estados já processados
-
-    # Algoritmo de conversão AFND para AFD
-    while unprocessed_states:
-        current_states = unprocessed_states.pop()  # Estado atual a ser processado
-        afd_states.append(current_states)  # Adiciona o estado atual ao conjunto de estados do AFD
-        processed_states.append(current_states)  # Marca o estado atual como processado
-
-        # Verificando se algum estado final do AFND está presente nos estados atuais do AFD
-        for final_state in afnd_final_states:
-            if final_state in current_states:
-                afd_final_states.append(current_states)  # Marca o estado atual como estado final do AFD
-                break
-
-        # Percorrendo o alfabeto para determinar as transições do AFD
-        for symbol in afnd_alphabet:
-            next_states = epsilon_closure(transition(current_states, symbol))  # Calcula os próximos estados
-            if next_states:
-                # Adiciona os próximos estados à lista de estados a serem processados
-                if next_states not in processed_states and next_states not in unprocessed_states:
-                    unprocessed_states.append(next_states)
-
-                current_states_key = ','.join(sorted(next_states))  # Chave para o estado atual do AFD
-                if current_states_key not in afd_delta:
-                    afd_delta[current_states_key] = {}
-                afd_delta[current_states_key][symbol] = next_states  # Atualiza a função de transição do AFD
-
-    # Retornando o AFD resultante
-    return {
-        'Q': [list(states) for states in afd_states],  # Converte os estados para listas
-        'V': afnd_alphabet,  # Mantém o alfabeto
-        'delta': afd_delta,  # Função de transição do AFD
-        'q0': list(epsilon_closure([afnd_initial_state])),  # Converte o estado inicial para uma lista
-        'F': [list(states) for states in afd_final_states]  # Converte os estados finais para listas
-    }
-
-# Função para gerar o código Graphviz a partir do AFND
-def generate_graphviz(afnd):
-    lines = ['digraph afnd {']
-    lines.append('    node [shape = doublecircle]; ' + '; '.join([' '.join(states) for states in afd['F']]) + ';')
-    lines.append('    node [shape = point]; qi;')
-    lines.append('    node [shape = circle];')
-
-    # Adicionando transições
-    for state, transitions in afnd['delta'].items():
-        for symbol, next_states in transitions.items():
-            for next_state in next_states:
-                lines.append('    {} -> {} [label="{}"];'.format(state, next_state, symbol))
-    lines.append('}')
-    return '\n'.join(lines)
-
-# Verificação de argumentos de linha de comando
-if len(sys.argv) < 3:
-    print("Utilização:")
-    print("Para converter AFND para Graphviz: python main.py afnd.json -graphviz")
-    print("Para converter AFND para AFD: python main.py afnd.json -output afd.json") 
-    sys.exit()
-
-# Obtendo o nome do arquivo AFND
-afnd_file = sys.argv[1]
-if not afnd_file.endswith('.json'):
-    print("Erro: O primeiro argumento deve ser um arquivo JSON.")
-    sys.exit()
-
-# Obtendo o modo de operação
-mode = sys.argv[2]
-
-# Verificando o modo e executando a operação correspondente
-if mode == '-graphviz':
-    try:
-        with open(afnd_file, 'r') as file:
-            afnd = json.load(file)
-    except FileNotFoundError:
-        print("Erro: Arquivo AFND não encontrado.")
-        sys.exit()
-    except json.JSONDecodeError:
-        print("Erro: Formato JSON inválido no arquivo AFND.")
-        sys.exit()
+# Permite importar o pacote automatos, que está na pasta acima desta
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from automatos.cache import cache_clear, cache_get, cache_key, cache_put
+from automatos.estatisticas import count, enable_stats_from_argv, phase
 
-    # Convertendo AFND para AFD
-    afd = convert_afnd_to_afd(afnd)
-    # Gerando código Graphviz
-    graphviz_code = generate_graphviz(afnd)
-    print(graphviz_code)
-
-elif mode == '-output':
-    if len(sys.argv) != 4 or not sys.argv[3].endswith('.json'):
-        print("Erro: Argumentos inválidos para conversão AFND para AFD.")
-        sys.exit()
-
-    afd_file = sys.argv[3]
 
+# Função para ler o AFND do arquivo JSON, terminando o programa com uma mensagem de erro se não for possível
+def load_afnd(afnd_file):
     try:
-        with open(afnd_file, 'r') as file:
-            afnd = json.load(file)
+        with phase('json_load'), open(afnd_file, 'r') as file:
+            return json.load(file)
     except FileNotFoundError:
         print("Erro: Arquivo AFND não encontrado.")
         sys.exit()
@@ -142,24 +20,133 @@ elif mode == '-output':
         print("Erro: Formato JSON inválido no arquivo AFND.")
         sys.exit()
 
-    # Convertendo AFND para AFD
-    afd = convert_afnd_to_afd(afnd)
 
-    # Convertendo os conjuntos de estados de 'set' para 'list'
-    afd['Q'] = [list(states) for states in afd['Q']]
-    for state, transitions in afd['delta'].items():
-        for symbol, next_states in transitions.items():
-            afd['delta'][state][symbol] = list(next_states)
-    afd['q0'] = list(afd['q0'])
-    afd['F'] = [list(states) for states in afd['F']]
+def main(argv):
+    # Verificação de argumentos de linha de comando
+    if len(argv) < 3:
+        print("Utilização:")
+        print("Para converter AFND para Graphviz: python main.py afnd.json -graphviz [-depth k] [-top n]")
+        print("Para converter AFND para AFD: python main.py afnd.json -output afd.json")
+        print("Para converter AFND para AFD mínimo: python main.py afnd.json -output afd.json -minimize")
+        print("Para guardar também os estados do AFND que compõem cada estado do AFD: python main.py afnd.json -output afd.json -subsets")
+        print("Para escrever o AFD no formato binário: python main.py afnd.json -output afd.afdb [-minimize]")
+        print("Opções da conversão: -no-cache (não usa a cache), -clear-cache (apaga a cache) e -workers n (usa n processos)")
+        print("Para medir tempos, contadores e memória: acrescentar --stats ou --stats=json")
+        print("Para reconhecer uma palavra diretamente no AFND: python main.py afnd.json -rec palavra [-cache estados]")
+        sys.exit()
 
-    try:
-        with open(afd_file, 'w') as file:
-            json.dump(afd, file, indent=4)
-        print("AFD escrito com sucesso em", afd_file)
-    except FileNotFoundError:
-        print("Erro: Caminho do arquivo de saída não encontrado.")
+    # Obtendo o nome do arquivo AFND
+    afnd_file = argv[1]
+    if not afnd_file.endswith('.json'):
+        print("Erro: O primeiro argumento deve ser um arquivo JSON.")
         sys.exit()
 
-else:
-    print("Erro: Modo inválido. Por favor, use '-graphviz' para gerar código Graphviz ou '-output' para converter AFND para AFD.")
+    # Obtendo o modo de operação
+    mode = argv[2]
+
+    # Ligando a instrumentação (tempos, contadores e memória), se a opção --stats estiver presente
+    enable_stats_from_argv(argv)
+
+    # Verificando o modo e executando a operação correspondente
+    if mode == '-graphviz':
+        from automatos.graphviz import write_afnd_dot
+        afnd = load_afnd(afnd_file)
+
+        # Gerando código Graphviz (com -depth k e/ou -top n, apenas um subgrafo)
+        depth = int(argv[argv.index('-depth') + 1]) if '-depth' in argv else None
+        top = int(argv[argv.index('-top') + 1]) if '-top' in argv else None
+        with phase('graphviz'):
+            write_afnd_dot(afnd, sys.stdout, depth, top)
+
+    elif mode == '-output':
+        if len(argv) < 4 or not argv[3].endswith(('.json', '.afdb')):
+            print("Erro: Argumentos inválidos para conversão AFND para AFD.")
+            sys.exit()
+
+        afd_file = argv[3]
+        afnd = load_afnd(afnd_file)
+
+        if '-clear-cache' in argv:
+            cache_clear()
+
+        # Procurando o AFD na cache, usando como chave o conteúdo do AFND
+        use_cache = '-no-cache' not in argv
+        with_subsets = '-subsets' in argv and '-minimize' not in argv
+        key = cache_key('afd-min' if '-minimize' in argv else 'afd-subconjuntos' if with_subsets else 'afd', afnd)
+        with phase('cache_get'):
+            afd = cache_get(key) if use_cache else None
+
+        if afd is None:
+            from automatos.afnd_determinizacao import afd_from_subsets, determinize, index_afnd
+            # Convertendo AFND para AFD (fechos-épsilon e construção de subconjuntos)
+            with phase('epsilon_closure'):
+                indexed = index_afnd(afnd)
+            count('closures_computed', indexed['closures_computed'])
+            with phase('subset_construction'):
+                if '-workers' in argv:
+                    # Construção de subconjuntos em paralelo (o resultado é igual ao da versão sequencial)
+                    from automatos.afnd_paralelo import determinize_parallel
+                    subsets_afd = determinize_parallel(indexed, int(argv[argv.index('-workers') + 1]))
+                else:
+                    subsets_afd = determinize(indexed)
+            count('dfa_states', len(subsets_afd['subsets']))
+            count('transitions_emitted', sum(1 for row in subsets_afd['delta'] for target in row if target >= 0))
+            if '-minimize' in argv:
+                from automatos.afd_minimizacao import minimize
+                # Minimizando o AFD (algoritmo de Hopcroft)
+                with phase('minimize'):
+                    afd = minimize(subsets_afd)
+                count('minimal_dfa_states', len(afd['Q']))
+            else:
+                afd = afd_from_subsets(indexed, subsets_afd, with_subsets)
+            if use_cache:
+                with phase('cache_put'):
+                    cache_put(key, afd)
+        else:
+            count('cache_hits')
+
+        try:
+            if afd_file.endswith('.afdb'):
+                from automatos.afd_compilado import compile_afd
+                from automatos.binario import write_binary
+                # Formato binário: o AFD é compilado numa tabela de transições densa
+                with phase('serialize'):
+                    write_binary(compile_afd(afd), afd_file)
+            else:
+                with phase('serialize'), open(afd_file, 'w') as file:
+                    json.dump(afd, file, indent=4)
+            print("AFD escrito com sucesso em", afd_file)
+        except FileNotFoundError:
+            print("Erro: Caminho do arquivo de saída não encontrado.")
+            sys.exit()
+
+    elif mode == '-rec':
+        if len(argv) < 4:
+            print("Erro: Falta a palavra a reconhecer.")
+            sys.exit()
+
+        from automatos.afnd_simulacao import accepts_afnd, compile_afnd, create_lazy_cache
+        word = argv[3]
+        afnd = load_afnd(afnd_file)
+
+        # Simulando o AFND diretamente, sem construir o AFD completo
+        cache = None
+        if '-cache' in argv:
+            cache = create_lazy_cache(int(argv[argv.index('-cache') + 1]))
+        with phase('epsilon_closure'):
+            compiled = compile_afnd(afnd)
+        count('closures_computed', compiled['closures_computed'])
+        with phase('simulate'):
+            recognized = accepts_afnd(compiled, word, cache)
+        count('words_processed')
+        if recognized:
+            print("'" + word + "' é reconhecida")
+        else:
+            print("'" + word + "' não é reconhecida")
+
+    else:
+        print("Erro: Modo inválido. Por favor, use '-graphviz' para gerar código Graphviz, '-output' para converter AFND para AFD ou '-rec' para reconhecer uma palavra.")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
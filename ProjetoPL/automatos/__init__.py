@@ -0,0 +1,25 @@
+# Pacote com o código partilhado pelas ferramentas das partes A, B e C.
+#
+# As funções principais estão disponíveis diretamente no pacote:
+#
+#     import automatos
+#     afd = automatos.load('af.json')
+#     automatos.validate(afd)
+#     compiled = automatos.compile(afd)
+#     automatos.recognize(compiled, 'abab')
+#
+# Os módulos só são importados quando uma destas funções é usada pela primeira vez,
+# para que importar o pacote seja rápido.
+
+__all__ = ['load', 'validate', 'compile', 'recognize', 'er_to_nfa', 'nfa_to_dfa', 'to_graphviz']
+
+
+def __getattr__(name):
+    if name in __all__:
+        import importlib
+        return getattr(importlib.import_module('automatos.api'), name)
+    raise AttributeError("module 'automatos' has no attribute '" + name + "'")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,65 @@
+import json
+import sys
+
+# Função para carregar a definição do autômato de um arquivo JSON
+def load_afd_from_json(file_path):
+    with open(file_path, 'r') as file:
+        afd_definition = json.load(file)
+    return afd_definition
+
+
+# Função para imprimir o digraph do autômato (ver automatos.graphviz.write_afd_dot)
+def print_digraph(afd_definition, depth=None, top=None):
+    from automatos.afd_compilado import compile_afd
+    from automatos.graphviz import write_afd_dot
+    write_afd_dot(compile_afd(afd_definition), sys.stdout, depth, top)
+
+
+# Função para reconhecer uma palavra no autômato
+def recognize_word(afd_definition, word):
+    current_state = afd_definition["q0"]
+    path = [current_state]
+    for symbol in word:
+        if symbol not in afd_definition["V"]:
+            return False, ["símbolo '" + symbol + "' não pertence ao alfabeto"]
+        if symbol not in afd_definition["delta"][current_state]:
+            return False, ["não há transição do estado '" + current_state + "' com o símbolo '" + symbol + "'"]
+        next_state = afd_definition["delta"][current_state][symbol]
+        path.append(symbol + "->" + next_state)
+        current_state = next_state
+    if current_state in afd_definition["F"]:
+        return True, path
+    else:
+        return False, ["o estado '" + current_state + "' não é final"]
+
+
+# Função para validar a definição do autômato
+def validate_afd_definition(afd_definition):
+    # Conjuntos dos estados e dos símbolos, para que cada verificação seja feita em tempo constante
+    states = set(afd_definition["Q"])
+    alphabet = set(afd_definition["V"])
+    delta = afd_definition["delta"]
+
+    # Verificar se todos os estados definidos em Q estão presentes nas transições
+    for state in afd_definition["Q"]:
+        if state not in delta:
+            raise ValueError("O estado '" + state + "' definido em Q não está presente nas transições delta.")
+
+    # Verificar se o estado inicial (q0) está presente na definição
+    if afd_definition["q0"] not in states:
+        raise ValueError("O estado inicial 'q0' não está presente na definição dos estados Q.")
+
+    # Verificar se todos os estados finais (F) estão presentes na definição
+    for final_state in afd_definition["F"]:
+        if final_state not in states:
+            raise ValueError("O estado final '" + final_state + "' não está presente na definição dos estados Q.")
+
+    # Verificar se todas as transições do delta correspondem a estados e símbolos válidos
+    for state, transitions in delta.items():
+        if state not in states:
+            raise ValueError("O estado '" + state + "' nas transições delta não está presente na definição dos estados Q.")
+        for symbol, next_state in transitions.items():
+            if symbol not in alphabet:
+                raise ValueError("O símbolo '" + symbol + "' nas transições delta não está presente no alfabeto V.")
+            if next_state not in states:
+                raise ValueError("O estado '" + next_state + "' nas transições delta não está presente na definição dos estados Q.")
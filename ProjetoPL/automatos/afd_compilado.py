@@ -0,0 +1,76 @@
+from array import array
+
+# Valor usado na tabela de transições quando não há transição definida
+NO_TRANSITION = -1
+
+
+# Função para compilar a definição (já validada) do autômato numa tabela de transições indexada por inteiros
+def compile_afd(afd_definition):
+    states = list(afd_definition["Q"])
+    state_index = {state: index for index, state in enumerate(states)}
+    # Cada símbolo do alfabeto corresponde a uma coluna da tabela
+    columns = {symbol: column for column, symbol in enumerate(afd_definition["V"])}
+    n_symbols = len(columns)
+
+    # A tabela é um array plano com uma linha por estado: table[estado * n_symbols + coluna]
+    table = array('i', [NO_TRANSITION]) * (len(states) * n_symbols)
+    for state, transitions in afd_definition["delta"].items():
+        row = state_index[state] * n_symbols
+        for symbol, next_state in transitions.items():
+            table[row + columns[symbol]] = state_index[next_state]
+
+    # Os estados finais são guardados num bitset (um bit por estado)
+    finals = bytearray((len(states) + 7) // 8)
+    for final_state in afd_definition["F"]:
+        index = state_index[final_state]
+        finals[index >> 3] |= 1 << (index & 7)
+
+    return {
+        "states": states,
+        "columns": columns,
+        "n_symbols": n_symbols,
+        "table": table,
+        "initial": state_index[afd_definition["q0"]],
+        "finals": finals,
+    }
+
+
+# Função rápida que apenas indica se a palavra é aceite pelo autômato compilado
+def accepts(compiled, word):
+    columns = compiled["columns"]
+    table = compiled["table"]
+    n_symbols = compiled["n_symbols"]
+    state = compiled["initial"]
+    for symbol in word:
+        column = columns.get(symbol)
+        if column is None:
+            return False
+        state = table[state * n_symbols + column]
+        if state < 0:
+            return False
+    return (compiled["finals"][state >> 3] >> (state & 7)) & 1 == 1
+
+
+# Função para reconhecer uma palavra no autômato compilado, com as mesmas mensagens de recognize_word.
+# O caminho só é construído quando trace=True; caso contrário, uma palavra aceite devolve um caminho vazio.
+def recognize_compiled(compiled, word, trace=True):
+    states = compiled["states"]
+    columns = compiled["columns"]
+    table = compiled["table"]
+    n_symbols = compiled["n_symbols"]
+    state = compiled["initial"]
+    path = [states[state]] if trace else None
+    for symbol in word:
+        column = columns.get(symbol)
+        if column is None:
+            return False, ["símbolo '" + symbol + "' não pertence ao alfabeto"]
+        next_state = table[state * n_symbols + column]
+        if next_state < 0:
+            return False, ["não há transição do estado '" + states[state] + "' com o símbolo '" + symbol + "'"]
+        if trace:
+            path.append(symbol + "->" + states[next_state])
+        state = next_state
+    if (compiled["finals"][state >> 3] >> (state & 7)) & 1:
+        return True, path if trace else []
+    else:
+        return False, ["o estado '" + states[state] + "' não é final"]
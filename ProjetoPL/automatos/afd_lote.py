@@ -0,0 +1,64 @@
+import sys
+
+from automatos.afd_compilado import accepts, recognize_compiled
+
+# Número de resultados acumulados antes de cada escrita na saída
+WRITE_BLOCK = 8192
+
+
+# Função para formatar o resultado do reconhecimento de uma palavra numa linha de saída
+def format_result(word, recognized, reasons=None):
+    if recognized:
+        return word + "\treconhecida\n"
+    if reasons:
+        return word + "\tnão reconhecida\t" + "; ".join(reasons) + "\n"
+    return word + "\tnão reconhecida\n"
+
+
+# Função para obter as palavras (uma por linha) de um iterável de linhas, sem o fim de linha
+def read_words(lines):
+    for line in lines:
+        if line.endswith("\n"):
+            line = line[:-1]
+        if line.endswith("\r"):
+            line = line[:-1]
+        yield line
+
+
+# Função para obter a linha de resultado de cada palavra
+def format_results(compiled, words, with_reason=False):
+    if with_reason:
+        for word in words:
+            recognized, reasons = recognize_compiled(compiled, word, trace=False)
+            yield format_result(word, recognized, reasons)
+    else:
+        for word in words:
+            yield format_result(word, accepts(compiled, word))
+
+
+# Função para reconhecer as palavras de forma contínua, escrevendo um resultado por linha.
+# Apenas um bloco de resultados é mantido em memória de cada vez.
+def recognize_stream(compiled, lines, output, with_reason=False):
+    block = []
+    count = 0
+    for result in format_results(compiled, read_words(lines), with_reason):
+        block.append(result)
+        if len(block) >= WRITE_BLOCK:
+            output.write("".join(block))
+            count += len(block)
+            block = []
+    if block:
+        output.write("".join(block))
+        count += len(block)
+    output.flush()
+    return count
+
+
+# Função para reconhecer as palavras de um arquivo (ou da entrada padrão, se o caminho for '-')
+def recognize_file(compiled, file_path, output=None, with_reason=False):
+    if output is None:
+        output = sys.stdout
+    if file_path == "-":
+        return recognize_stream(compiled, sys.stdin, output, with_reason)
+    with open(file_path, "r", encoding="utf-8") as file:
+        return recognize_stream(compiled, file, output, with_reason)
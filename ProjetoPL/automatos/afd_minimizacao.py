@@ -0,0 +1,123 @@
+from collections import deque
+
+
+# Função para converter um AFD no formato da PartA (estados com nomes) na forma compacta usada por determinize
+def compact_from_afd(afd_definition):
+    states = list(afd_definition["Q"])
+    # O estado inicial passa a ser o estado 0
+    states.remove(afd_definition["q0"])
+    states.insert(0, afd_definition["q0"])
+    state_index = {state: index for index, state in enumerate(states)}
+    alphabet = list(afd_definition["V"])
+    delta = []
+    for state in states:
+        transitions = afd_definition["delta"].get(state, {})
+        delta.append([state_index[transitions[symbol]] if symbol in transitions else -1 for symbol in alphabet])
+    return {
+        'alphabet': alphabet,
+        'delta': delta,
+        'finals': [state_index[state] for state in afd_definition["F"]],
+    }
+
+
+# Função para minimizar um AFD compacto com o algoritmo de Hopcroft (refinamento de partições).
+# Devolve o AFD mínimo no formato aceite por validate_afd_definition, com os estados renumerados
+# q0, q1, ... pela ordem de uma pesquisa em largura a partir do estado inicial.
+def minimize(afd):
+    alphabet = afd['alphabet']
+    n_symbols = len(alphabet)
+    # Acrescenta um estado morto (o último) para tornar a função de transição total
+    dead = len(afd['delta'])
+    n_states = dead + 1
+    delta = [[dead if target < 0 else target for target in row] for row in afd['delta']]
+    delta.append([dead] * n_symbols)
+
+    # inverse[símbolo][estado] = estados que chegam ao estado com o símbolo
+    inverse = [[[] for _ in range(n_states)] for _ in range(n_symbols)]
+    for state, row in enumerate(delta):
+        for symbol, target in enumerate(row):
+            inverse[symbol][target].append(state)
+
+    # Partição inicial: estados finais e não finais
+    finals = set(afd['finals'])
+    non_finals = set(range(n_states)) - finals
+    blocks = [block for block in (set(finals), non_finals) if block]
+    block_of = [0] * n_states
+    for index, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = index
+
+    # Basta usar como separador o menor dos dois blocos iniciais
+    smallest = min(range(len(blocks)), key=lambda index: len(blocks[index]))
+    pending = deque((smallest, symbol) for symbol in range(n_symbols))
+    in_pending = set(pending)
+
+    while pending:
+        splitter = pending.popleft()
+        in_pending.discard(splitter)
+        block, symbol = splitter
+
+        # Agrupa, por bloco, os estados que chegam ao separador com o símbolo
+        touched = {}
+        for target in blocks[block]:
+            for state in inverse[symbol][target]:
+                touched.setdefault(block_of[state], []).append(state)
+
+        for index, members in touched.items():
+            current = blocks[index]
+            if len(members) == len(current):
+                continue
+            # Divide o bloco; o novo bloco é sempre o menor das duas partes
+            for state in members:
+                current.discard(state)
+            if len(members) <= len(current):
+                new_block = set(members)
+            else:
+                new_block = current
+                blocks[index] = set(members)
+            new_index = len(blocks)
+            blocks.append(new_block)
+            for state in new_block:
+                block_of[state] = new_index
+            for other_symbol in range(n_symbols):
+                if (new_index, other_symbol) not in in_pending:
+                    pending.append((new_index, other_symbol))
+                    in_pending.add((new_index, other_symbol))
+
+    # Renumera os blocos por ordem de descoberta a partir do estado inicial, ignorando o bloco morto
+    dead_block = block_of[dead]
+    representative = {}
+    for state in range(n_states):
+        representative.setdefault(block_of[state], state)
+    names = {block_of[0]: "q0"}
+    order = deque([block_of[0]])
+    min_delta = {}
+    min_finals = []
+    while order:
+        block = order.popleft()
+        state = representative[block]
+        transitions = {}
+        for symbol, target in zip(alphabet, delta[state]):
+            target_block = block_of[target]
+            if target_block == dead_block:
+                continue
+            if target_block not in names:
+                names[target_block] = "q" + str(len(names))
+                order.append(target_block)
+            transitions[symbol] = names[target_block]
+        min_delta[names[block]] = transitions
+        if state in finals:
+            min_finals.append(names[block])
+
+    return {
+        "V": list(alphabet),
+        "Q": list(names.values()),
+        "delta": min_delta,
+        "q0": "q0",
+        "F": min_finals,
+    }
+
+
+# Função para minimizar um AFD no formato da PartA
+def minimize_afd(afd_definition):
+    return minimize(compact_from_afd(afd_definition))
@@ -0,0 +1,81 @@
+import io
+import os
+import sys
+import multiprocessing
+import tracemalloc
+from collections import deque
+
+from automatos.afd_lote import format_results, read_words
+
+# Tamanho (em bytes) de cada pedaço do arquivo entregue a um processo
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Autômato compilado e opções de cada processo, definidos uma única vez por _init_worker
+_worker_compiled = None
+_worker_path = None
+_worker_with_reason = False
+
+
+# Função para dividir o arquivo em intervalos de bytes que terminam sempre num fim de linha
+def split_byte_ranges(file_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            # Avança até ao fim da linha atual para não cortar nenhuma palavra
+            file.readline()
+            end = min(file.tell(), size)
+            yield start, end
+            start = end
+
+
+# Função executada uma vez em cada processo. Com o método 'fork' os argumentos são herdados
+# pelo processo filho sem serem serializados; com 'spawn' são serializados uma vez por processo.
+def _init_worker(compiled, file_path, with_reason):
+    global _worker_compiled, _worker_path, _worker_with_reason
+    # A instrumentação (--stats) mede apenas o processo principal
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _worker_compiled = compiled
+    _worker_path = file_path
+    _worker_with_reason = with_reason
+
+
+# Função para reconhecer as palavras de um intervalo de bytes do arquivo.
+# O texto é lido com os mesmos fins de linha que afd_lote.recognize_file ('\n', '\r\n' e '\r'); como os
+# intervalos terminam sempre depois de um '\n', nenhum fim de linha '\r\n' fica dividido entre dois intervalos.
+def _recognize_range(byte_range):
+    start, end = byte_range
+    with open(_worker_path, "rb") as file:
+        file.seek(start)
+        data = file.read(end - start)
+    words = read_words(io.TextIOWrapper(io.BytesIO(data), encoding="utf-8"))
+    return "".join(format_results(_worker_compiled, words, _worker_with_reason))
+
+
+# Função para reconhecer as palavras de um arquivo em paralelo, escrevendo os resultados pela ordem de entrada.
+# Só são mantidos em curso, no máximo, dois pedaços por processo, para que a memória usada seja limitada.
+def recognize_file_parallel(compiled, file_path, output=None, with_reason=False, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    if output is None:
+        output = sys.stdout
+    if workers is None:
+        workers = os.cpu_count() or 1
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    count = 0
+    with context.Pool(workers, initializer=_init_worker, initargs=(compiled, file_path, with_reason)) as pool:
+        pending = deque()
+        for byte_range in split_byte_ranges(file_path, chunk_size):
+            pending.append(pool.apply_async(_recognize_range, (byte_range,)))
+            if len(pending) >= 2 * workers:
+                results = pending.popleft().get()
+                output.write(results)
+                count += results.count("\n")
+        while pending:
+            results = pending.popleft().get()
+            output.write(results)
+            count += results.count("\n")
+    output.flush()
+    return count
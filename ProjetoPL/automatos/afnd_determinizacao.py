@@ -0,0 +1,138 @@
+# Símbolos que representam transições epsilon (a PartB usa '' e os exemplos da PartC usam 'epsilon')
+EPSILON_SYMBOLS = ("", "epsilon")
+
+
+# Função para indexar o AFND: cada estado passa a ser um bit e cada conjunto de estados um inteiro (bitmask)
+def index_afnd(afnd):
+    states = list(afnd['Q'])
+    state_index = {state: index for index, state in enumerate(states)}
+    alphabet = [symbol for symbol in afnd['V'] if symbol not in EPSILON_SYMBOLS]
+    delta = afnd['delta']
+
+    # Fecho-épsilon de cada estado, calculado uma única vez e guardado como bitmask
+    closures = [None] * len(states)
+
+    def closure_of(index):
+        if closures[index] is None:
+            mask = 1 << index
+            stack = [index]
+            while stack:
+                transitions = delta.get(states[stack.pop()], {})
+                for epsilon in EPSILON_SYMBOLS:
+                    for target in transitions.get(epsilon, ()):
+                        bit = 1 << state_index[target]
+                        if not mask & bit:
+                            mask |= bit
+                            stack.append(state_index[target])
+            closures[index] = mask
+        return closures[index]
+
+    # moves[símbolo][estado] = fecho-épsilon dos estados alcançados a partir do estado com o símbolo
+    moves = []
+    for symbol in alphabet:
+        row = [0] * len(states)
+        for state, transitions in delta.items():
+            mask = 0
+            for target in transitions.get(symbol, ()):
+                mask |= closure_of(state_index[target])
+            row[state_index[state]] = mask
+        moves.append(row)
+
+    initial_state = afnd['q0'] if isinstance(afnd['q0'], str) else afnd['q0'][0]
+    finals = 0
+    for final_state in afnd['F']:
+        finals |= 1 << state_index[final_state]
+
+    return {
+        'states': states,
+        'alphabet': alphabet,
+        'moves': moves,
+        'initial': closure_of(state_index[initial_state]),
+        'finals': finals,
+        'closures_computed': sum(1 for mask in closures if mask is not None),
+    }
+
+
+# Função para calcular o conjunto de estados alcançado a partir de um conjunto (bitmask) com um símbolo
+def move(row, mask):
+    result = 0
+    while mask:
+        low = mask & -mask
+        result |= row[low.bit_length() - 1]
+        mask ^= low
+    return result
+
+
+# Função para aplicar a construção de subconjuntos ao AFND indexado.
+# Os estados do AFD são numerados pela ordem em que são descobertos (0 é o estado inicial)
+# e delta[estado][símbolo] é o estado de destino, ou -1 quando não há transição.
+def determinize(indexed):
+    moves = indexed['moves']
+    subsets = [indexed['initial']]
+    ids = {indexed['initial']: 0}
+    delta = []
+    current = 0
+    while current < len(subsets):
+        mask = subsets[current]
+        row = []
+        for symbol_moves in moves:
+            target = move(symbol_moves, mask)
+            if not target:
+                row.append(-1)
+                continue
+            target_id = ids.get(target)
+            if target_id is None:
+                target_id = len(subsets)
+                ids[target] = target_id
+                subsets.append(target)
+            row.append(target_id)
+        delta.append(row)
+        current += 1
+
+    finals = indexed['finals']
+    return {
+        'alphabet': indexed['alphabet'],
+        'subsets': subsets,
+        'delta': delta,
+        'finals': [state for state, mask in enumerate(subsets) if mask & finals],
+    }
+
+
+# Função para obter os nomes (ordenados) dos estados do AFND contidos num bitmask
+def subset_names(states, mask):
+    names = []
+    while mask:
+        low = mask & -mask
+        names.append(states[low.bit_length() - 1])
+        mask ^= low
+    return sorted(names)
+
+
+# Função para converter o resultado de determinize no formato de saída (o da PartA). Os estados recebem os
+# nomes canónicos q0, q1, ... pela ordem em que determinize os descobre (pesquisa em largura a partir de q0),
+# por isso converter o mesmo AFND produz sempre o mesmo resultado. Com with_subsets=True, a tabela
+# 'subconjuntos' indica os estados do AFND (ordenados) que compõem cada estado do AFD.
+def afd_from_subsets(indexed, afd, with_subsets=False):
+    names = ['q' + str(state) for state in range(len(afd['subsets']))]
+    alphabet = afd['alphabet']
+
+    afd_delta = {}
+    for name, row in zip(names, afd['delta']):
+        afd_delta[name] = {symbol: names[target] for symbol, target in zip(alphabet, row) if target >= 0}
+
+    result = {
+        'V': alphabet,
+        'Q': names,
+        'delta': afd_delta,
+        'q0': names[0],
+        'F': [names[state] for state in afd['finals']],
+    }
+    if with_subsets:
+        result['subconjuntos'] = {name: subset_names(indexed['states'], mask) for name, mask in zip(names, afd['subsets'])}
+    return result
+
+
+# Função para converter um AFND em um AFD
+def convert_afnd_to_afd(afnd, with_subsets=False):
+    indexed = index_afnd(afnd)
+    return afd_from_subsets(indexed, determinize(indexed), with_subsets)
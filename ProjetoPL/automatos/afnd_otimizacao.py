@@ -0,0 +1,201 @@
+def fechoEpsilon(estado, delta, fechos):
+    # Calcula (e memoriza) o fecho-épsilon de um estado: os estados alcançáveis só com transições vazias.
+    if estado not in fechos:
+        fecho = [estado]
+        vistos = {estado}
+        pilha = [estado]
+        while pilha:
+            for destino in delta[pilha.pop()].get('', []):
+                if destino not in vistos:
+                    vistos.add(destino)
+                    fecho.append(destino)
+                    pilha.append(destino)
+        fechos[estado] = fecho
+    return fechos[estado]
+
+def contaTransicoes(delta):
+    # Conta as transições (origem, símbolo, destino) de uma função de transição.
+    return sum(len(destinos) for transicoes in delta.values() for destinos in transicoes.values())
+
+def eliminaEpsilon(afnd):
+    # Remove as transições vazias: cada estado passa a ter as transições dos estados do seu fecho-épsilon
+    # e passa a ser final se o fecho contiver um estado final.
+    # Sem transições vazias, só o estado inicial e os destinos de transições com símbolo continuam alcançáveis,
+    # por isso as novas transições só são calculadas para os estados alcançáveis a partir do estado inicial.
+    delta, finais = afnd['delta'], set(afnd['F'])
+    fechos = {}
+    novo_delta, novos_finais = {}, []
+    pilha = [afnd['q0']]
+    novo_delta[afnd['q0']] = None
+    while pilha:
+        estado = pilha.pop()
+        transicoes = {}
+        final = False
+        for alcancado in fechoEpsilon(estado, delta, fechos):
+            for simbolo, destinos in delta[alcancado].items():
+                if simbolo == '':
+                    continue
+                # Um dicionário mantém a ordem dos destinos sem os repetir.
+                transicoes.setdefault(simbolo, {}).update(dict.fromkeys(destinos))
+            final = final or alcancado in finais
+        novo_delta[estado] = {simbolo: list(destinos) for simbolo, destinos in transicoes.items()}
+        if final:
+            novos_finais.append(estado)
+        for destinos in transicoes.values():
+            for destino in destinos:
+                if destino not in novo_delta:
+                    novo_delta[destino] = None
+                    pilha.append(destino)
+    return novo_delta, novos_finais
+
+def estadosUteis(delta, inicial, finais):
+    # Devolve os estados alcançáveis a partir do estado inicial que conseguem chegar a um estado final.
+    alcancaveis = {inicial}
+    pilha = [inicial]
+    inverso = {estado: [] for estado in delta}
+    while pilha:
+        estado = pilha.pop()
+        for destinos in delta[estado].values():
+            for destino in destinos:
+                inverso[destino].append(estado)
+                if destino not in alcancaveis:
+                    alcancaveis.add(destino)
+                    pilha.append(destino)
+    vivos = set(estado for estado in finais if estado in alcancaveis)
+    pilha = list(vivos)
+    while pilha:
+        for origem in inverso[pilha.pop()]:
+            if origem not in vivos:
+                vivos.add(origem)
+                pilha.append(origem)
+    # O estado inicial é sempre mantido, mesmo que a linguagem seja vazia.
+    vivos.add(inicial)
+    return vivos
+
+def juntaEquivalentes(estados, delta, inicial, finais):
+    # Junta estados trivialmente equivalentes (mesma finalidade e mesmas transições) até não haver mudanças.
+    # Devolve um dicionário que associa cada estado ao estado que o representa.
+    # Depois da primeira passagem, só os antecessores dos estados juntados na passagem anterior podem mudar de
+    # assinatura, por isso só esses são recalculados (lista de trabalho sobre o índice inverso das transições).
+    representante = {estado: estado for estado in estados}
+    posicao = {estado: indice for indice, estado in enumerate(estados)}
+    membros = {estado: [estado] for estado in estados}
+    inverso = {estado: [] for estado in estados}
+    for estado in estados:
+        for destinos in delta[estado].values():
+            for destino in destinos:
+                inverso[destino].append(estado)
+
+    def assinaturaDe(estado):
+        return (estado in finais, tuple(sorted(
+            (simbolo, tuple(sorted(set(representante[destino] for destino in destinos))))
+            for simbolo, destinos in delta[estado].items())))
+
+    # Assinatura de cada representante e representante de cada assinatura
+    assinaturas = {}
+    porAssinatura = {}
+    pendentes = estados
+    while pendentes:
+        grupos = {}
+        for estado in pendentes:
+            antiga = assinaturas.get(estado)
+            if antiga is not None and porAssinatura.get(antiga) == estado:
+                del porAssinatura[antiga]
+            assinatura = assinaturaDe(estado)
+            assinaturas[estado] = assinatura
+            grupos.setdefault(assinatura, []).append(estado)
+        # Estados (originais) cujo representante mudou nesta passagem
+        alterados = []
+        for assinatura, grupo in grupos.items():
+            # Um representante que não foi recalculado pode ter a mesma assinatura.
+            existente = porAssinatura.get(assinatura)
+            if existente is not None:
+                grupo.append(existente)
+            if len(grupo) > 1:
+                # O estado inicial, se estiver no grupo, é o representante; senão, o primeiro na ordem de estados.
+                escolhido = inicial if inicial in grupo else min(grupo, key=posicao.__getitem__)
+                for estado in grupo:
+                    if estado != escolhido:
+                        for membro in membros[estado]:
+                            representante[membro] = escolhido
+                        alterados.extend(membros[estado])
+                        membros[escolhido].extend(membros.pop(estado))
+                        del assinaturas[estado]
+            else:
+                escolhido = grupo[0]
+            porAssinatura[assinatura] = escolhido
+        # Os antecessores (que ainda são representantes) dos estados alterados são recalculados na passagem seguinte.
+        recalcular = {}
+        for membro in alterados:
+            for origem in inverso[membro]:
+                if representante[origem] == origem:
+                    recalcular[origem] = None
+        pendentes = list(recalcular)
+    return representante
+
+def renumeraAFND(afnd):
+    # Dá aos estados os nomes canónicos q0, q1, ... pela ordem de uma pesquisa em largura a partir do
+    # estado inicial (as transições são seguidas pela ordem em que aparecem em delta).
+    # Os estados inalcançáveis ficam no fim, pela ordem original.
+    ordem = {afnd['q0']: 0}
+    visitados = [afnd['q0']]
+    for estado in visitados:
+        for destinos in afnd['delta'].get(estado, {}).values():
+            for destino in destinos:
+                if destino not in ordem:
+                    ordem[destino] = len(visitados)
+                    visitados.append(destino)
+    for estado in afnd['Q']:
+        if estado not in ordem:
+            ordem[estado] = len(visitados)
+            visitados.append(estado)
+    nomes = {estado: f'q{posicao}' for estado, posicao in ordem.items()}
+    return {
+        'V': afnd['V'],
+        'Q': [nomes[estado] for estado in visitados],
+        'delta': {nomes[estado]: {simbolo: [nomes[destino] for destino in destinos]
+                                  for simbolo, destinos in afnd['delta'].get(estado, {}).items()}
+                  for estado in visitados},
+        'q0': nomes[afnd['q0']],
+        'F': sorted((nomes[estado] for estado in afnd['F']), key=lambda nome: int(nome[1:])),
+    }
+
+def otimizaAFND(afnd):
+    # Otimiza um AFND (por exemplo, o gerado por convertERParaAFND): elimina as transições vazias,
+    # remove os estados inalcançáveis ou mortos e junta estados trivialmente equivalentes.
+    # Devolve o AFND otimizado, no mesmo formato e com os estados renumerados (renumeraAFND),
+    # e um relatório com o número de estados removidos e o número de transições antes e depois
+    # (a eliminação das transições vazias pode acrescentar transições).
+    delta, finais = eliminaEpsilon(afnd)
+    inicial = afnd['q0']
+    uteis = estadosUteis(delta, inicial, finais)
+    estados = [estado for estado in afnd['Q'] if estado in uteis]
+    delta = {estado: {simbolo: [destino for destino in destinos if destino in uteis]
+                      for simbolo, destinos in delta[estado].items()}
+             for estado in estados}
+    finais = set(estado for estado in finais if estado in uteis)
+    representante = juntaEquivalentes(estados, delta, inicial, finais)
+
+    otimizado = {
+        'V': list(afnd['V']),
+        'Q': [estado for estado in estados if representante[estado] == estado],
+        'delta': {},
+        'q0': inicial,
+        'F': [estado for estado in estados if estado in finais and representante[estado] == estado],
+    }
+    for estado in otimizado['Q']:
+        transicoes = {}
+        for simbolo, destinos in delta[estado].items():
+            lista = list(dict.fromkeys(representante[destino] for destino in destinos))
+            if lista:
+                transicoes[simbolo] = lista
+        otimizado['delta'][estado] = transicoes
+
+    otimizado = renumeraAFND(otimizado)
+
+    relatorio = {
+        'estados_removidos': len(afnd['Q']) - len(otimizado['Q']),
+        'transicoes_antes': contaTransicoes(afnd['delta']),
+        'transicoes_depois': contaTransicoes(otimizado['delta']),
+    }
+    return otimizado, relatorio
@@ -0,0 +1,84 @@
+import os
+import multiprocessing
+import tracemalloc
+
+from automatos.afnd_determinizacao import move
+
+# Construção de subconjuntos em paralelo, nível a nível: os estados descobertos num nível da pesquisa em
+# largura (a fronteira) são divididos pelos processos, que calculam os destinos de cada estado com cada símbolo.
+# O processo principal mantém o único índice de estados e numera os novos estados percorrendo os resultados
+# pela ordem da fronteira e dos símbolos, que é a ordem da versão sequencial (determinize): o resultado é igual.
+
+# Número mínimo de estados da fronteira para a dividir pelos processos (abaixo disto o custo de comunicação domina)
+MIN_PARALLEL_FRONTIER = 64
+
+# Número de partes em que a fronteira é dividida, por processo
+PARTS_PER_WORKER = 4
+
+# Transições do AFND (moves de index_afnd) de cada processo, definidas uma única vez por _init_worker
+_worker_moves = None
+
+
+# Função executada uma vez em cada processo; com o método 'fork' as transições são herdadas sem serialização
+def _init_worker(moves):
+    global _worker_moves
+    # A instrumentação (--stats) mede apenas o processo principal
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _worker_moves = moves
+
+
+# Função para calcular, para cada estado (bitmask) de uma parte da fronteira, o destino com cada símbolo
+def _expand(masks, moves=None):
+    if moves is None:
+        moves = _worker_moves
+    return [[move(symbol_moves, mask) for symbol_moves in moves] for mask in masks]
+
+
+# Função para aplicar a construção de subconjuntos ao AFND indexado usando workers processos.
+# Devolve o mesmo que determinize(indexed).
+def determinize_parallel(indexed, workers=None):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    moves = indexed['moves']
+    subsets = [indexed['initial']]
+    ids = {indexed['initial']: 0}
+    delta = []
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    with context.Pool(workers, initializer=_init_worker, initargs=(moves,)) as pool:
+        start = 0
+        while start < len(subsets):
+            # A fronteira são os estados descobertos no nível anterior
+            frontier = subsets[start:]
+            start = len(subsets)
+            if len(frontier) < MIN_PARALLEL_FRONTIER:
+                rows = _expand(frontier, moves)
+            else:
+                size = -(-len(frontier) // (workers * PARTS_PER_WORKER))
+                parts = [frontier[index:index + size] for index in range(0, len(frontier), size)]
+                rows = [row for part in pool.map(_expand, parts) for row in part]
+
+            # Numeração dos novos estados, pela ordem da fronteira e dos símbolos
+            for targets in rows:
+                row = []
+                for target in targets:
+                    if not target:
+                        row.append(-1)
+                        continue
+                    target_id = ids.get(target)
+                    if target_id is None:
+                        target_id = len(subsets)
+                        ids[target] = target_id
+                        subsets.append(target)
+                    row.append(target_id)
+                delta.append(row)
+
+    finals = indexed['finals']
+    return {
+        'alphabet': indexed['alphabet'],
+        'subsets': subsets,
+        'delta': delta,
+        'finals': [state for state, mask in enumerate(subsets) if mask & finals],
+    }
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+from automatos.afnd_determinizacao import index_afnd, move
+
+# Número máximo de estados do AFD guardados, por omissão, na cache preguiçosa
+DEFAULT_CACHE_STATES = 4096
+
+
+# Função para preparar o AFND para simulação direta (fechos-épsilon pré-calculados por estado)
+def compile_afnd(afnd):
+    indexed = index_afnd(afnd)
+    indexed['columns'] = {symbol: column for column, symbol in enumerate(indexed['alphabet'])}
+    return indexed
+
+
+# Função para criar uma cache preguiçosa de estados do AFD, limitada a max_states estados.
+# Cada estado do AFD (um bitmask de estados do AFND) guarda as transições já calculadas,
+# e o estado usado há mais tempo é descartado quando a cache fica cheia.
+def create_lazy_cache(max_states=DEFAULT_CACHE_STATES):
+    return {'max_states': max_states, 'states': OrderedDict(), 'hits': 0, 'misses': 0}
+
+
+# Função para simular o AFND sobre uma palavra, mantendo o conjunto de estados ativos como bitmask.
+# Sem cache o custo é O(n·m); com cache as transições já vistas custam uma consulta.
+def accepts_afnd(compiled, word, cache=None):
+    columns = compiled['columns']
+    moves = compiled['moves']
+    current = compiled['initial']
+    if cache is None:
+        for symbol in word:
+            column = columns.get(symbol)
+            if column is None:
+                return False
+            current = move(moves[column], current)
+            if not current:
+                return False
+        return bool(current & compiled['finals'])
+
+    states = cache['states']
+    n_symbols = len(moves)
+    for symbol in word:
+        column = columns.get(symbol)
+        if column is None:
+            return False
+        row = states.get(current)
+        if row is None:
+            row = [None] * n_symbols
+            states[current] = row
+            if len(states) > cache['max_states']:
+                states.popitem(last=False)
+        else:
+            states.move_to_end(current)
+        next_state = row[column]
+        if next_state is None:
+            cache['misses'] += 1
+            next_state = move(moves[column], current)
+            row[column] = next_state
+        else:
+            cache['hits'] += 1
+        current = next_state
+        if not current:
+            return False
+    return bool(current & compiled['finals'])
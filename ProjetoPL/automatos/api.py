@@ -0,0 +1,69 @@
+# Funções de alto nível do pacote (reexportadas em automatos). Os módulos que fazem o trabalho
+# são importados dentro de cada função, apenas quando ela é usada.
+
+
+# Função para carregar um autômato: a definição JSON (.json) ou o AFD compilado do formato binário (.afdb)
+def load(file_path):
+    if file_path.endswith('.afdb'):
+        from automatos.binario import load_binary
+        return load_binary(file_path)
+    from automatos.afd import load_afd_from_json
+    return load_afd_from_json(file_path)
+
+
+# Função para validar a definição de um AFD (levanta ValueError se for inválida)
+def validate(afd_definition):
+    from automatos.afd import validate_afd_definition
+    validate_afd_definition(afd_definition)
+    return afd_definition
+
+
+# Função para compilar a definição de um AFD numa tabela de transições.
+# O resultado pode ser guardado e reutilizado em todas as chamadas a recognize.
+def compile(afd_definition):
+    from automatos.afd_compilado import compile_afd
+    return compile_afd(afd_definition)
+
+
+# Função para reconhecer uma palavra num AFD (definição ou AFD compilado).
+# Devolve (reconhecida, caminho) ou (False, motivos), como recognize_word.
+def recognize(automaton, word, trace=True):
+    from automatos.afd_compilado import recognize_compiled
+    if 'table' not in automaton:
+        automaton = compile(automaton)
+    return recognize_compiled(automaton, word, trace)
+
+
+# Função para converter uma expressão regular (formato da PartB) num AFND, opcionalmente otimizado
+def er_to_nfa(er, optimize=False):
+    from automatos.er_compilador import convertERParaAFND
+    afnd = convertERParaAFND(er)
+    if optimize:
+        from automatos.afnd_otimizacao import otimizaAFND
+        afnd, _ = otimizaAFND(afnd)
+    return afnd
+
+
+# Função para converter um AFND num AFD (formato da PartA, estados q0, q1, ... pela ordem de uma pesquisa
+# em largura). Com minimize=True o AFD é minimizado; com subsets=True (e sem minimizar), a tabela
+# 'subconjuntos' indica os estados do AFND que compõem cada estado.
+def nfa_to_dfa(afnd, minimize=False, subsets=False):
+    from automatos.afnd_determinizacao import afd_from_subsets, determinize, index_afnd
+    indexed = index_afnd(afnd)
+    afd = determinize(indexed)
+    if minimize:
+        from automatos.afd_minimizacao import minimize as minimize_afd
+        return minimize_afd(afd)
+    return afd_from_subsets(indexed, afd, subsets)
+
+
+# Função para gerar o código Graphviz de um AFD (definição ou AFD compilado).
+# Com depth e/ou top, apenas um subgrafo é gerado (ver automatos.graphviz.select_states).
+def to_graphviz(automaton, depth=None, top=None):
+    import io
+    from automatos.graphviz import write_afd_dot
+    if 'table' not in automaton:
+        automaton = compile(automaton)
+    output = io.StringIO()
+    write_afd_dot(automaton, output, depth, top)
+    return output.getvalue()
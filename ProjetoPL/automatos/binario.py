@@ -0,0 +1,181 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+# Formato binário de um AFD compilado (extensão .afdb). Todas as secções começam em múltiplos de 8 bytes:
+#   cabeçalho   -> HEADER (sempre little-endian)
+#   alfabeto    -> n_symbols + 1 deslocamentos uint32 seguidos dos símbolos em UTF-8
+#   nomes       -> n_states + 1 deslocamentos uint32 seguidos dos nomes dos estados em UTF-8
+#   tabela      -> n_states * n_symbols inteiros int32 (-1 quando não há transição), na ordem de bytes indicada no cabeçalho
+#   finais      -> bitmap com um bit por estado
+MAGIC = b"AFDB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHBxIIIQQQQ")
+LITTLE_ENDIAN, BIG_ENDIAN = 0, 1
+
+
+# Função para alinhar um deslocamento a 8 bytes
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+# Função para codificar uma lista de textos como deslocamentos uint32 seguidos dos textos em UTF-8
+def _encode_strings(strings):
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = array("I", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets.tobytes() + b"".join(encoded)
+
+
+# Sequência de textos lida diretamente do arquivo mapeado: cada texto só é descodificado quando é pedido
+class MappedStrings:
+    def __init__(self, buffer, offset, count):
+        self._buffer = buffer
+        self._offsets = buffer[offset:offset + 4 * (count + 1)].cast("I")
+        self._data = offset + 4 * (count + 1)
+        self._count = count
+        self._swap = sys.byteorder != "little"
+
+    def __len__(self):
+        return self._count
+
+    def _offset(self, index):
+        value = self._offsets[index]
+        if self._swap:
+            value = int.from_bytes(value.to_bytes(4, "big"), "little")
+        return value
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start, end = self._offset(index), self._offset(index + 1)
+        return bytes(self._buffer[self._data + start:self._data + end]).decode("utf-8")
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+
+# Função para escrever um AFD compilado (ver compile_afd) no formato binário
+def write_binary(compiled, file_path):
+    n_states = len(compiled["states"])
+    n_symbols = compiled["n_symbols"]
+    symbols = sorted(compiled["columns"], key=compiled["columns"].get)
+    alphabet = _encode_strings(symbols)
+    names = _encode_strings(list(compiled["states"]))
+    table = compiled["table"].tobytes()
+    finals = bytes(compiled["finals"])
+
+    alphabet_offset = _align(HEADER.size)
+    names_offset = _align(alphabet_offset + len(alphabet))
+    table_offset = _align(names_offset + len(names))
+    finals_offset = _align(table_offset + len(table))
+    byte_order = LITTLE_ENDIAN if sys.byteorder == "little" else BIG_ENDIAN
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, byte_order, n_states, n_symbols, compiled["initial"],
+                         alphabet_offset, names_offset, table_offset, finals_offset)
+
+    # O arquivo é escrito num arquivo temporário na mesma pasta e depois substitui o antigo de uma só vez:
+    # os processos que têm o arquivo antigo mapeado (load_binary) continuam a ler o conteúdo antigo
+    directory = os.path.dirname(os.path.abspath(file_path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".afdb")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            for offset, data in ((0, header), (alphabet_offset, alphabet), (names_offset, names),
+                                 (table_offset, table), (finals_offset, finals)):
+                file.write(b"\0" * (offset - file.tell()))
+                file.write(data)
+        os.chmod(temporary_path, _file_mode(file_path))
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+# Função para obter as permissões do arquivo a escrever: as do arquivo existente ou, se não existir,
+# as de um arquivo novo (0o666 sem os bits da umask), como com open(file_path, "wb")
+def _file_mode(file_path):
+    try:
+        return os.stat(file_path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+# Função para verificar que uma secção (deslocamento e tamanho em bytes) está dentro do arquivo
+def _check_section(buffer, file_path, offset, size):
+    if offset + size > len(buffer):
+        raise ValueError("O arquivo '" + file_path + "' está truncado ou corrompido.")
+
+
+# Função para carregar um AFD no formato binário. O arquivo é mapeado em memória e a tabela de transições
+# é usada diretamente (sem cópia), pelo que o resultado pode ser usado por accepts e recognize_compiled.
+def load_binary(file_path):
+    with open(file_path, "rb") as file:
+        buffer = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    if len(buffer) < HEADER.size:
+        raise ValueError("O arquivo '" + file_path + "' não está no formato binário de autômatos.")
+    (magic, version, byte_order, n_states, n_symbols, initial,
+     alphabet_offset, names_offset, table_offset, finals_offset) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("O arquivo '" + file_path + "' não está no formato binário de autômatos.")
+    if version != FORMAT_VERSION:
+        raise ValueError("Versão " + str(version) + " do formato binário não suportada.")
+
+    # Todas as secções têm de caber no arquivo (um arquivo truncado não pode ser usado)
+    _check_section(buffer, file_path, alphabet_offset, 4 * (n_symbols + 1))
+    _check_section(buffer, file_path, names_offset, 4 * (n_states + 1))
+    _check_section(buffer, file_path, table_offset, 4 * n_states * n_symbols)
+    _check_section(buffer, file_path, finals_offset, (n_states + 7) // 8)
+    alphabet = MappedStrings(buffer, alphabet_offset, n_symbols)
+    names = MappedStrings(buffer, names_offset, n_states)
+    for strings, offset, count in ((alphabet, alphabet_offset, n_symbols), (names, names_offset, n_states)):
+        _check_section(buffer, file_path, offset + 4 * (count + 1), strings._offset(count))
+    if not 0 <= initial < n_states:
+        raise ValueError("O arquivo '" + file_path + "' está truncado ou corrompido.")
+
+    symbols = list(alphabet)
+    table = buffer[table_offset:table_offset + 4 * n_states * n_symbols].cast("i")
+    if byte_order != (LITTLE_ENDIAN if sys.byteorder == "little" else BIG_ENDIAN):
+        # Ordem de bytes diferente da máquina: a tabela tem de ser copiada e convertida
+        table = array("i", table.tobytes())
+        table.byteswap()
+
+    return {
+        "states": names,
+        "columns": {symbol: column for column, symbol in enumerate(symbols)},
+        "n_symbols": n_symbols,
+        "table": table,
+        "initial": initial,
+        "finals": buffer[finals_offset:finals_offset + (n_states + 7) // 8],
+    }
+
+
+# Função para reconstruir a definição do autômato (formato JSON) a partir de um AFD compilado
+def afd_from_compiled(compiled):
+    states = list(compiled["states"])
+    symbols = sorted(compiled["columns"], key=compiled["columns"].get)
+    table = compiled["table"]
+    n_symbols = compiled["n_symbols"]
+    finals = compiled["finals"]
+    delta = {}
+    for index, state in enumerate(states):
+        row = index * n_symbols
+        delta[state] = {symbol: states[table[row + column]]
+                        for column, symbol in enumerate(symbols) if table[row + column] >= 0}
+    return {
+        "V": symbols,
+        "Q": states,
+        "delta": delta,
+        "q0": states[compiled["initial"]],
+        "F": [state for index, state in enumerate(states) if (finals[index >> 3] >> (index & 7)) & 1],
+    }
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import tempfile
+
+# Versão das ferramentas incluída na chave: deve mudar sempre que o resultado das conversões mudar
+CACHE_VERSION = "3"
+
+# Tamanho máximo (em bytes) da cache, por omissão
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Extensão dos arquivos guardados na cache
+ENTRY_SUFFIX = ".json"
+
+
+# Função para obter a pasta da cache (pode ser alterada com a variável de ambiente PROJETOPL_CACHE_DIR)
+def cache_dir():
+    directory = os.environ.get("PROJETOPL_CACHE_DIR")
+    if not directory:
+        directory = os.path.join(os.path.expanduser("~"), ".cache", "projetopl")
+    return directory
+
+
+# Função para calcular a chave de um artefacto a partir do tipo e da forma canónica do JSON de entrada
+def cache_key(kind, data):
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256()
+    digest.update((CACHE_VERSION + "\0" + kind + "\0").encode("utf-8"))
+    digest.update(canonical.encode("utf-8"))
+    return kind + "-" + digest.hexdigest()
+
+
+# Função para ler um artefacto da cache; devolve None se não existir ou estiver corrompido
+def cache_get(key, directory=None):
+    path = os.path.join(directory or cache_dir(), key + ENTRY_SUFFIX)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            value = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    # Atualiza a data de modificação, usada para descartar primeiro as entradas usadas há mais tempo
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return value
+
+
+# Função para guardar um artefacto na cache. A escrita é feita num arquivo temporário que depois
+# substitui o definitivo (os.replace é atómico), para que processos concorrentes nunca leiam metade de um arquivo.
+def cache_put(key, value, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+    directory = directory or cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            json.dump(value, file, separators=(",", ":"))
+        os.replace(temporary_path, os.path.join(directory, key + ENTRY_SUFFIX))
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    cache_evict(directory, max_bytes)
+
+
+# Função para descartar as entradas usadas há mais tempo até a cache ocupar no máximo max_bytes
+def cache_evict(directory=None, max_bytes=DEFAULT_MAX_BYTES):
+    directory = directory or cache_dir()
+    entries = []
+    total = 0
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(ENTRY_SUFFIX):
+            continue
+        try:
+            info = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((info.st_mtime, info.st_size, entry.path))
+        total += info.st_size
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+# Função para apagar todas as entradas da cache
+def cache_clear(directory=None):
+    directory = directory or cache_dir()
+    if not os.path.isdir(directory):
+        return
+    for entry in os.scandir(directory):
+        if entry.name.endswith(ENTRY_SUFFIX):
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,150 @@
+from automatos.afd_compilado import NO_TRANSITION, compile_afd
+
+# Edição incremental de um AFD (formato da PartA): cada alteração valida apenas a parte afetada da definição
+# e atualiza no lugar a tabela de transições compilada, sem voltar a validar nem a compilar o autômato inteiro.
+#
+#     editable = create_editable(afd_definition)
+#     add_state(editable, 'q9')
+#     add_transition(editable, 'q2', 'a', 'q9')
+#     add_final(editable, 'q9')
+#     accepts(editable['compiled'], 'aba')
+#
+# As linhas dos estados removidos ficam na tabela como lápides (sem transições e com o nome None na lista
+# de estados) e são reutilizadas pelos estados acrescentados depois. Nas listas Q e F da definição, um estado
+# removido é substituído pelo último da lista, por isso a ordem destas listas pode mudar. Para exportar o AFD
+# (por exemplo com write_binary), deve compilar-se de novo editable['definition'].
+
+
+# Função para preparar um AFD (já validado) para edição: compila-o e constrói os índices usados nas edições
+def create_editable(afd_definition):
+    compiled = compile_afd(afd_definition)
+    index = {state: position for position, state in enumerate(compiled["states"])}
+    # Transições que chegam a cada estado, como pares (estado de origem, símbolo)
+    incoming = {state: set() for state in afd_definition["Q"]}
+    for state, transitions in afd_definition["delta"].items():
+        for symbol, next_state in transitions.items():
+            incoming[next_state].add((state, symbol))
+    return {
+        "definition": afd_definition,
+        "compiled": compiled,
+        "index": index,
+        "alphabet": set(afd_definition["V"]),
+        # Posição de cada estado nas listas Q e F da definição
+        "q_positions": {state: position for position, state in enumerate(afd_definition["Q"])},
+        "f_positions": {state: position for position, state in enumerate(afd_definition["F"])},
+        "incoming": incoming,
+        "free": [],
+    }
+
+
+# Função para obter a posição de um estado na tabela, verificando se está definido em Q
+def _state_index(editable, state, message):
+    position = editable["index"].get(state)
+    if position is None:
+        raise ValueError(message.format(state))
+    return position
+
+
+# Função para acrescentar um elemento ao fim de uma lista da definição, registando a sua posição
+def _append_listed(items, positions, item):
+    positions[item] = len(items)
+    items.append(item)
+
+
+# Função para retirar um elemento de uma lista da definição sem a percorrer: o último elemento passa para
+# a posição do elemento retirado
+def _remove_listed(items, positions, item):
+    position = positions.pop(item)
+    last = items.pop()
+    if position < len(items):
+        items[position] = last
+        positions[last] = position
+
+
+# Função para acrescentar um estado (sem transições e não final)
+def add_state(editable, state):
+    if state in editable["index"]:
+        raise ValueError("O estado '" + state + "' já está definido em Q.")
+    compiled = editable["compiled"]
+    n_symbols = compiled["n_symbols"]
+    if editable["free"]:
+        # Reutiliza a linha de um estado removido (já sem transições e com o bit de final limpo)
+        position = editable["free"].pop()
+        compiled["states"][position] = state
+    else:
+        position = len(compiled["states"])
+        compiled["states"].append(state)
+        compiled["table"].extend([NO_TRANSITION] * n_symbols)
+        if position >> 3 >= len(compiled["finals"]):
+            compiled["finals"].append(0)
+    editable["index"][state] = position
+    editable["incoming"][state] = set()
+    definition = editable["definition"]
+    _append_listed(definition["Q"], editable["q_positions"], state)
+    definition["delta"][state] = {}
+
+
+# Função para remover um estado, com as transições que saem dele e as que chegam a ele
+def remove_state(editable, state):
+    position = _state_index(editable, state, "O estado '{}' não está presente na definição dos estados Q.")
+    definition = editable["definition"]
+    if state == definition["q0"]:
+        raise ValueError("O estado inicial '" + state + "' não pode ser removido.")
+    for symbol in list(definition["delta"][state]):
+        remove_transition(editable, state, symbol)
+    for source, symbol in list(editable["incoming"][state]):
+        remove_transition(editable, source, symbol)
+    remove_final(editable, state)
+
+    del definition["delta"][state]
+    _remove_listed(definition["Q"], editable["q_positions"], state)
+    del editable["index"][state]
+    del editable["incoming"][state]
+    # A linha fica como lápide até ser reutilizada por add_state
+    editable["compiled"]["states"][position] = None
+    editable["free"].append(position)
+
+
+# Função para acrescentar (ou substituir) a transição de state com symbol
+def add_transition(editable, state, symbol, next_state):
+    message = "O estado '{}' nas transições delta não está presente na definição dos estados Q."
+    position = _state_index(editable, state, message)
+    target = _state_index(editable, next_state, message)
+    if symbol not in editable["alphabet"]:
+        raise ValueError("O símbolo '" + symbol + "' nas transições delta não está presente no alfabeto V.")
+    transitions = editable["definition"]["delta"][state]
+    if symbol in transitions:
+        editable["incoming"][transitions[symbol]].discard((state, symbol))
+    transitions[symbol] = next_state
+    editable["incoming"][next_state].add((state, symbol))
+    compiled = editable["compiled"]
+    compiled["table"][position * compiled["n_symbols"] + compiled["columns"][symbol]] = target
+
+
+# Função para remover a transição de state com symbol
+def remove_transition(editable, state, symbol):
+    position = _state_index(editable, state, "O estado '{}' nas transições delta não está presente na definição dos estados Q.")
+    transitions = editable["definition"]["delta"][state]
+    if symbol not in transitions:
+        raise ValueError("não há transição do estado '" + state + "' com o símbolo '" + symbol + "'")
+    editable["incoming"][transitions.pop(symbol)].discard((state, symbol))
+    compiled = editable["compiled"]
+    compiled["table"][position * compiled["n_symbols"] + compiled["columns"][symbol]] = NO_TRANSITION
+
+
+# Função para tornar um estado final
+def add_final(editable, state):
+    position = _state_index(editable, state, "O estado final '{}' não está presente na definição dos estados Q.")
+    if state in editable["f_positions"]:
+        return
+    _append_listed(editable["definition"]["F"], editable["f_positions"], state)
+    editable["compiled"]["finals"][position >> 3] |= 1 << (position & 7)
+
+
+# Função para deixar de considerar um estado final
+def remove_final(editable, state):
+    position = _state_index(editable, state, "O estado final '{}' não está presente na definição dos estados Q.")
+    if state not in editable["f_positions"]:
+        return
+    _remove_listed(editable["definition"]["F"], editable["f_positions"], state)
+    editable["compiled"]["finals"][position >> 3] &= ~(1 << (position & 7)) & 0xFF
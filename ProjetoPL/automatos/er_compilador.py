@@ -0,0 +1,134 @@
+from array import array
+
+# Identificador de símbolo usado nas transições vazias (epsilon).
+EPSILON = -1
+
+def compilaER(er):
+    # Converte a expressão regular (dicionário) nos componentes de um AFND, sem recursão.
+    # Os estados são inteiros (0, 1, ...) e as transições ficam em três arrays paralelos
+    # (origem, símbolo, destino); os nomes só são criados na serialização (afndDeCompilado).
+    # A numeração dos estados e a ordem das transições são as da construção recursiva original.
+    origens, simbolos_transicao, destinos = array('i'), array('i'), array('i')
+    simbolos = {}  # Símbolo -> identificador, pela ordem de aparição.
+    total_estados = 0
+
+    # Cada elemento da pilha é [operador, argumentos, índice do próximo argumento, início, fim].
+    pilha = []
+    no, resultado = er, None
+    while True:
+        if no is not None:
+            if 'simb' in no or 'epsilon' in no:
+                # Símbolo ou transição vazia: dois estados novos e uma transição entre eles.
+                if 'simb' in no:
+                    simbolo = simbolos.setdefault(no['simb'], len(simbolos))
+                else:
+                    simbolo = EPSILON
+                origens.append(total_estados)
+                simbolos_transicao.append(simbolo)
+                destinos.append(total_estados + 1)
+                resultado = (total_estados, total_estados + 1)
+                total_estados += 2
+                if not pilha:
+                    break
+            elif no.get('op') in ('alt', 'kle'):
+                # Alternância e fecho de Kleene criam os seus estados de início e fim antes dos argumentos.
+                argumentos = no['args'] if no['op'] == 'alt' else no['args'][:1]
+                pilha.append([no['op'], argumentos, 0, total_estados, total_estados + 1])
+                total_estados += 2
+            elif no.get('op') in ('seq', 'trans'):
+                if not no['args']:
+                    raise ValueError("Sequência vazia na expressão regular")
+                pilha.append(['seq', no['args'], 0, None, None])
+            else:
+                # Se a expressão contiver um operador inválido, levanta um erro.
+                raise ValueError("Operador inválido na expressão regular")
+            no = None
+            continue
+
+        topo = pilha[-1]
+        operador, argumentos, indice, inicio, fim = topo
+        if resultado is not None:
+            # Liga o resultado do argumento acabado de processar ao operador do topo da pilha.
+            inicio_arg, fim_arg = resultado
+            if operador == 'alt':
+                ligacoes = ((inicio, inicio_arg), (fim_arg, fim))
+            elif operador == 'kle':
+                ligacoes = ((inicio, inicio_arg), (fim_arg, fim), (fim_arg, inicio_arg), (inicio, fim))
+            elif indice == 0:
+                topo[3] = inicio_arg
+                ligacoes = ()
+            else:
+                ligacoes = ((fim, inicio_arg),)
+            if operador == 'seq':
+                topo[4] = fim_arg
+            for origem, destino in ligacoes:
+                origens.append(origem)
+                simbolos_transicao.append(EPSILON)
+                destinos.append(destino)
+            indice += 1
+            topo[2] = indice
+            resultado = None
+
+        if indice < len(argumentos):
+            no = argumentos[indice]
+        else:
+            pilha.pop()
+            resultado = (topo[3], topo[4])
+            if not pilha:
+                break
+
+    return {
+        'total_estados': total_estados,
+        'simbolos': list(simbolos),
+        'origens': origens,
+        'simbolos_transicao': simbolos_transicao,
+        'destinos': destinos,
+        'inicio': resultado[0],
+        'fim': resultado[1],
+    }
+
+def ordemBFS(total_estados, inicio, origens, destinos):
+    # Devolve a posição de cada estado numa pesquisa em largura a partir do estado inicial
+    # (as transições de cada estado são seguidas pela ordem em que foram criadas).
+    # Os estados inalcançáveis ficam no fim, pela ordem original.
+    sucessores = [[] for _ in range(total_estados)]
+    for origem, destino in zip(origens, destinos):
+        sucessores[origem].append(destino)
+    ordem = [-1] * total_estados
+    ordem[inicio] = 0
+    visitados = [inicio]
+    for estado in visitados:
+        for destino in sucessores[estado]:
+            if ordem[destino] < 0:
+                ordem[destino] = len(visitados)
+                visitados.append(destino)
+    for estado in range(total_estados):
+        if ordem[estado] < 0:
+            ordem[estado] = len(visitados)
+            visitados.append(estado)
+    return ordem
+
+def afndDeCompilado(compilado):
+    # Serializa o resultado de compilaER num AFND (dicionário) com estados q0, q1, ... numerados pela ordem
+    # de uma pesquisa em largura a partir do estado inicial (q0), para que os nomes sejam canónicos.
+    ordem = ordemBFS(compilado['total_estados'], compilado['inicio'], compilado['origens'], compilado['destinos'])
+    nomes = [f'q{posicao}' for posicao in ordem]
+    simbolos = compilado['simbolos']
+    delta = {f'q{posicao}': {} for posicao in range(compilado['total_estados'])}
+    for origem, simbolo, destino in zip(compilado['origens'], compilado['simbolos_transicao'], compilado['destinos']):
+        chave = '' if simbolo == EPSILON else simbolos[simbolo]
+        transicoes = delta[nomes[origem]]
+        if chave not in transicoes:
+            transicoes[chave] = []
+        transicoes[chave].append(nomes[destino])
+    return {
+        'V': list(simbolos),  # Alfabeto do AFND.
+        'Q': list(delta),     # Conjunto de estados do AFND.
+        'delta': delta,       # Função de transição do AFND.
+        'q0': nomes[compilado['inicio']],  # Estado inicial do AFND.
+        'F': [nomes[compilado['fim']]],    # Conjunto de estados finais do AFND.
+    }
+
+def convertERParaAFND(expression):
+    # Converte uma expressão regular (dicionário) em um AFND (dicionário).
+    return afndDeCompilado(compilaER(expression))
@@ -0,0 +1,107 @@
+import atexit
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+# Estatísticas da execução atual, ou None quando a instrumentação está desligada (o caso normal).
+# Com a instrumentação desligada, phase devolve sempre o mesmo contexto vazio e count não faz nada.
+_stats = None
+_disabled_phase = nullcontext()
+
+
+# Fase medida: tempo de relógio, número de execuções e pico de memória (incluindo as fases encaixadas)
+class _Phase:
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        peaks = _stats["peak_stack"]
+        if peaks:
+            peaks[-1] = max(peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        peaks.append(0)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        peaks = _stats["peak_stack"]
+        peak = max(peaks.pop(), tracemalloc.get_traced_memory()[1])
+        if peaks:
+            peaks[-1] = max(peaks[-1], peak)
+        phase = _stats["phases"].setdefault(self.name, {"seconds": 0.0, "calls": 0, "peak_bytes": 0})
+        phase["seconds"] += seconds
+        phase["calls"] += 1
+        phase["peak_bytes"] = max(phase["peak_bytes"], peak)
+        return False
+
+
+# Função para ligar a instrumentação. O relatório é escrito (em stream) no fim da execução,
+# em texto ou em JSON. Devolve True se a instrumentação foi ligada.
+def enable_stats(json_format=False, stream=None):
+    global _stats
+    if _stats is not None:
+        return True
+    _stats = {"phases": {}, "counters": {}, "peak_stack": [], "start": time.perf_counter()}
+    tracemalloc.start()
+    atexit.register(write_report, json_format, stream)
+    return True
+
+
+# Função para ligar a instrumentação a partir dos argumentos da linha de comando (--stats ou --stats=json)
+def enable_stats_from_argv(argv):
+    if "--stats=json" in argv:
+        return enable_stats(json_format=True)
+    if "--stats" in argv:
+        return enable_stats()
+    return False
+
+
+# Função que indica se a instrumentação está ligada
+def stats_enabled():
+    return _stats is not None
+
+
+# Função para medir uma fase: usar como "with phase('nome'):"
+def phase(name):
+    if _stats is None:
+        return _disabled_phase
+    return _Phase(name)
+
+
+# Função para somar um valor a um contador
+def count(name, amount=1):
+    if _stats is not None:
+        _stats["counters"][name] = _stats["counters"].get(name, 0) + amount
+
+
+# Função para obter as métricas recolhidas até agora
+def get_metrics():
+    if _stats is None:
+        return None
+    return {
+        "total_seconds": time.perf_counter() - _stats["start"],
+        "peak_bytes": tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0,
+        "phases": _stats["phases"],
+        "counters": _stats["counters"],
+    }
+
+
+# Função para escrever o relatório (resumo em texto ou métricas em JSON)
+def write_report(json_format=False, stream=None):
+    metrics = get_metrics()
+    if metrics is None:
+        return
+    stream = stream or sys.stderr
+    metrics["peak_bytes"] = max([metrics["peak_bytes"]] + [phase["peak_bytes"] for phase in metrics["phases"].values()])
+    if json_format:
+        json.dump(metrics, stream, indent=4)
+        stream.write("\n")
+        return
+    stream.write("Estatísticas ({:.4f} s, pico de memória {:.1f} KiB):\n".format(metrics["total_seconds"], metrics["peak_bytes"] / 1024))
+    for name, phase in metrics["phases"].items():
+        stream.write("  {:<24} {:>10.4f} s {:>6}x {:>12.1f} KiB\n".format(name, phase["seconds"], phase["calls"], phase["peak_bytes"] / 1024))
+    for name, value in metrics["counters"].items():
+        stream.write("  {:<24} {:>10}\n".format(name, value))
@@ -0,0 +1,176 @@
+import heapq
+import io
+import re
+import sys
+
+# Escrita do código Graphviz (DOT) de AFD compilados e de AFND, diretamente num stream.
+# As transições paralelas (mesma origem e mesmo destino) são juntas numa só aresta, cujo rótulo tem
+# os símbolos agrupados em intervalos (por exemplo "a-e,x"). Para autômatos grandes, pode escrever-se
+# apenas um subgrafo: os estados a no máximo depth passos do estado inicial e/ou os top estados com
+# mais transições (de entrada e de saída).
+
+# Número de linhas acumuladas antes de cada escrita no stream
+WRITE_BLOCK = 8192
+
+# Nomes que podem ser escritos no DOT sem aspas
+PLAIN_ID = re.compile(r'[A-Za-z_][A-Za-z_0-9]*\Z')
+
+# Caracteres usados nos rótulos para separar símbolos e escrever intervalos
+RANGE_SEPARATORS = ('-', ',')
+
+
+# Função para escrever um nome de estado como identificador DOT (entre aspas, se necessário)
+def _dot_id(name):
+    if PLAIN_ID.match(name):
+        return name
+    return '"' + name.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+# Função para obter o rótulo de uma aresta a partir dos seus símbolos.
+# Sequências de três ou mais caracteres consecutivos são escritas como intervalos (a-e).
+# Os símbolos que contêm '-' ou ',' são escritos entre plicas e, nesse caso ou se houver símbolos com mais de
+# um caractere, não são feitos intervalos, para o rótulo não ser ambíguo.
+def symbol_ranges(symbols):
+    if any(len(symbol) != 1 or symbol in RANGE_SEPARATORS for symbol in symbols):
+        return ','.join("'" + symbol + "'" if '-' in symbol or ',' in symbol else symbol for symbol in symbols)
+    if len(symbols) == 1:
+        return symbols[0]
+    codes = sorted(set(ord(symbol) for symbol in symbols))
+    parts = []
+    start = 0
+    for end in range(1, len(codes) + 1):
+        if end == len(codes) or codes[end] != codes[end - 1] + 1:
+            first, last = codes[start], codes[end - 1]
+            if last - first >= 2:
+                parts.append(chr(first) + '-' + chr(last))
+            else:
+                parts.extend(chr(code) for code in range(first, last + 1))
+            start = end
+    return ','.join(parts)
+
+
+# Função para escolher os estados a escrever: todos, os que estão a no máximo depth passos do estado inicial
+# (pesquisa em largura) e/ou os top estados com mais transições. Devolve a lista de estados, pela ordem original.
+def select_states(states, initial, successors, depth=None, top=None):
+    selected = states
+    if depth is not None:
+        distance = {initial: 0}
+        frontier = [initial]
+        for level in range(depth):
+            next_frontier = []
+            for state in frontier:
+                for next_state in successors(state):
+                    if next_state not in distance:
+                        distance[next_state] = level + 1
+                        next_frontier.append(next_state)
+            frontier = next_frontier
+        selected = [state for state in selected if state in distance]
+    if top is not None and top < len(selected):
+        # Grau de cada estado: transições que saem dele mais transições que chegam a ele (contando cada símbolo)
+        degree = {}
+        for state in states:
+            for next_state, symbols in successors(state, with_symbols=True):
+                degree[state] = degree.get(state, 0) + len(symbols)
+                degree[next_state] = degree.get(next_state, 0) + len(symbols)
+        busiest = set(heapq.nlargest(top, selected, key=lambda state: degree.get(state, 0)))
+        selected = [state for state in selected if state in busiest]
+    return selected
+
+
+# Função para escrever o grafo no stream; edges(state) devolve os pares (destino, símbolos) de cada estado.
+# Só são escritas as arestas entre estados escolhidos.
+def _write_graph(output, graph_name, names, states, initial, is_final, edges, total):
+    block = ['digraph ' + graph_name + ' {\n' if graph_name else 'digraph {\n']
+    if len(states) < total:
+        block.append('// subgrafo com ' + str(len(states)) + ' de ' + str(total) + ' estados\n')
+    # Identificadores DOT de cada estado, calculados uma só vez
+    dot_ids = {}
+    for state in states:
+        dot_ids[state] = _dot_id(names(state))
+    finals = [dot_ids[state] for state in states if is_final(state)]
+    if finals:
+        block.append('node [shape = doublecircle]; ' + '; '.join(finals) + ';\n')
+    block.append('node [shape = point]; initial;\n')
+    block.append('node [shape = circle];\n')
+    if initial in dot_ids:
+        block.append('initial->' + dot_ids[initial] + ';\n')
+    for state in states:
+        source = dot_ids[state]
+        for next_state, symbols in edges(state):
+            target = dot_ids.get(next_state)
+            if target is None:
+                continue
+            label = symbol_ranges(symbols)
+            if '"' in label or '\\' in label:
+                label = label.replace('\\', '\\\\').replace('"', '\\"')
+            block.append(source + '->' + target + '[label="' + label + '"];\n')
+            if len(block) >= WRITE_BLOCK:
+                output.write(''.join(block))
+                block = []
+    block.append('}\n')
+    output.write(''.join(block))
+    output.flush()
+
+
+# Função para escrever o código Graphviz de um AFD compilado (ver afd_compilado.compile_afd ou binario.load_binary)
+def write_afd_dot(compiled, output=None, depth=None, top=None):
+    if output is None:
+        output = sys.stdout
+    names = compiled["states"]
+    table = compiled["table"]
+    n_symbols = compiled["n_symbols"]
+    symbols = [None] * n_symbols
+    for symbol, column in compiled["columns"].items():
+        symbols[column] = symbol
+    finals = compiled["finals"]
+
+    # Transições de um estado agrupadas por destino, pela ordem das colunas
+    def edges(state):
+        grouped = {}
+        row = state * n_symbols
+        for column, next_state in enumerate(table[row:row + n_symbols]):
+            if next_state >= 0:
+                grouped.setdefault(next_state, []).append(symbols[column])
+        return grouped.items()
+
+    def successors(state, with_symbols=False):
+        return edges(state) if with_symbols else (next_state for next_state, _ in edges(state))
+
+    # Os estados removidos por automatos.edicao (nome None) são ignorados
+    states = [state for state in range(len(names)) if names[state] is not None]
+    selected = select_states(states, compiled["initial"], successors, depth, top)
+    _write_graph(output, '', names.__getitem__, selected, compiled["initial"],
+                 lambda state: (finals[state >> 3] >> (state & 7)) & 1, edges, len(states))
+
+
+# Função para escrever o código Graphviz de um AFND (formato da PartB/PartC, destinos em listas)
+def write_afnd_dot(afnd, output=None, depth=None, top=None):
+    if output is None:
+        output = sys.stdout
+    delta = afnd['delta']
+    finals = set(afnd['F'])
+
+    # Transições de um estado agrupadas por destino, pela ordem em que aparecem
+    def edges(state):
+        grouped = {}
+        for symbol, next_states in delta.get(state, {}).items():
+            for next_state in next_states:
+                # As transições vazias ('' ou 'epsilon') são escritas com o símbolo ε
+                grouped.setdefault(next_state, []).append(symbol if symbol not in ('', 'epsilon') else 'ε')
+        return grouped.items()
+
+    def successors(state, with_symbols=False):
+        return edges(state) if with_symbols else (next_state for next_state, _ in edges(state))
+
+    # O estado inicial pode ser dado como texto ou como lista com um só estado
+    initial = afnd['q0'] if isinstance(afnd['q0'], str) else afnd['q0'][0]
+    states = list(afnd['Q'])
+    selected = select_states(states, initial, successors, depth, top)
+    _write_graph(output, 'afnd', str, selected, initial, finals.__contains__, edges, len(states))
+
+
+# Função para gerar o código Graphviz de um AFND como texto
+def generate_graphviz(afnd, depth=None, top=None):
+    output = io.StringIO()
+    write_afnd_dot(afnd, output, depth, top)
+    return output.getvalue()
@@ -0,0 +1,196 @@
+import json
+import sys
+
+from automatos.afnd_determinizacao import EPSILON_SYMBOLS, index_afnd, move
+
+# Pesquisa de vários padrões num texto: todos os padrões (expressões regulares da PartB ou AFND) são juntos
+# num único AFND, com os estados finais marcados com o número do padrão, e o texto é lido uma só vez, em
+# pedaços. Para cada posição do texto são indicados os padrões com alguma ocorrência (não vazia) que termina
+# nessa posição.
+#
+# A pesquisa não é ancorada: antes de cada símbolo os estados iniciais de todos os padrões são acrescentados
+# ao conjunto de estados ativos. Os conjuntos de estados (bitmasks) são os estados de um AFD construído de
+# forma preguiçosa, guardado numa cache com um número máximo de estados; quando a cache fica cheia é
+# esvaziada, para que a memória usada não dependa do tamanho do texto.
+
+# Número de caracteres lidos de cada vez
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Número máximo de estados do AFD guardados, por omissão, na cache
+DEFAULT_CACHE_STATES = 4096
+
+# Número de ocorrências acumuladas antes de cada escrita na saída
+WRITE_BLOCK = 8192
+
+# Nome do estado inicial do AFND que junta os padrões
+START_STATE = 'inicio'
+
+
+# Função para juntar os AFND dos padrões num só AFND, com um estado inicial ligado por transições vazias
+# ao estado inicial de cada padrão. Os estados do padrão i passam a chamar-se 'p<i>_<nome>'.
+# Devolve o AFND e, para cada padrão, a lista dos seus estados finais.
+def merge_patterns(afnds):
+    alphabet = []
+    states = [START_STATE]
+    delta = {START_STATE: {'': []}}
+    pattern_finals = []
+    for number, afnd in enumerate(afnds):
+        prefix = 'p' + str(number) + '_'
+        for symbol in afnd['V']:
+            if symbol not in EPSILON_SYMBOLS and symbol not in alphabet:
+                alphabet.append(symbol)
+        states.extend(prefix + state for state in afnd['Q'])
+        for state, transitions in afnd['delta'].items():
+            delta[prefix + state] = {('' if symbol in EPSILON_SYMBOLS else symbol): [prefix + target for target in targets]
+                                     for symbol, targets in transitions.items()}
+        initial_state = afnd['q0'] if isinstance(afnd['q0'], str) else afnd['q0'][0]
+        delta[START_STATE][''].append(prefix + initial_state)
+        pattern_finals.append([prefix + state for state in afnd['F']])
+    merged = {
+        'V': alphabet,
+        'Q': states,
+        'delta': delta,
+        'q0': START_STATE,
+        'F': [state for finals in pattern_finals for state in finals],
+    }
+    return merged, pattern_finals
+
+
+# Função para preparar a pesquisa dos padrões; cada padrão é uma expressão regular (formato da PartB)
+# ou um AFND (dicionário com 'delta')
+def compile_patterns(patterns):
+    from automatos.er_compilador import convertERParaAFND
+    afnds = [pattern if 'delta' in pattern else convertERParaAFND(pattern) for pattern in patterns]
+    merged, pattern_finals = merge_patterns(afnds)
+    indexed = index_afnd(merged)
+    state_index = {state: index for index, state in enumerate(indexed['states'])}
+    pattern_masks = []
+    for finals in pattern_finals:
+        mask = 0
+        for state in finals:
+            mask |= 1 << state_index[state]
+        pattern_masks.append(mask)
+    return {
+        'columns': {symbol: column for column, symbol in enumerate(indexed['alphabet'])},
+        'moves': indexed['moves'],
+        'initial': indexed['initial'],
+        'pattern_masks': pattern_masks,
+    }
+
+
+# Função para criar a cache de estados do AFD usada na pesquisa, limitada a max_states estados
+def create_search_cache(max_states=DEFAULT_CACHE_STATES):
+    return {'max_states': max_states, 'states': {}, 'misses': 0, 'flushes': 0}
+
+
+# Função para obter (ou criar) o estado do AFD correspondente a um conjunto de estados do AFND.
+# Cada estado é uma lista [bitmask, transições por coluna, padrões aceites]; as transições apontam
+# diretamente para os estados de destino.
+def _dfa_state(searcher, cache, mask):
+    states = cache['states']
+    state = states.get(mask)
+    if state is None:
+        if len(states) >= cache['max_states']:
+            # Cache cheia: é esvaziada (os estados antigos deixam de ser usados e são libertados)
+            states.clear()
+            cache['flushes'] += 1
+        accepted = tuple(pattern for pattern, pattern_mask in enumerate(searcher['pattern_masks']) if mask & pattern_mask)
+        state = [mask, [None] * len(searcher['moves']), accepted]
+        states[mask] = state
+    return state
+
+
+# Função para pesquisar os padrões num texto dado em pedaços (iterável de strings).
+# Gera pares (fim, padrão): fim é a posição (em caracteres, a contar do início do texto) a seguir ao último
+# caractere da ocorrência.
+def search_stream(searcher, chunks, cache=None):
+    if cache is None:
+        cache = create_search_cache()
+    columns = searcher['columns']
+    moves = searcher['moves']
+    initial = searcher['initial']
+    # Estado antes de ler qualquer símbolo: nenhuma ocorrência em curso
+    current = _dfa_state(searcher, cache, 0)
+    offset = 0
+    for chunk in chunks:
+        for symbol in chunk:
+            offset += 1
+            column = columns.get(symbol)
+            if column is None:
+                # Símbolo fora do alfabeto: nenhuma ocorrência continua depois dele
+                current = cache['states'].get(0) or _dfa_state(searcher, cache, 0)
+                continue
+            next_state = current[1][column]
+            if next_state is None:
+                cache['misses'] += 1
+                next_state = _dfa_state(searcher, cache, move(moves[column], current[0] | initial))
+                current[1][column] = next_state
+            current = next_state
+            for pattern in current[2]:
+                yield offset, pattern
+
+
+# Função para ler um arquivo de texto em pedaços de chunk_size caracteres
+def read_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+# Função para pesquisar os padrões num arquivo (ou na entrada padrão, se o caminho for '-'),
+# escrevendo uma linha "fim<TAB>padrão" por ocorrência. Devolve o número de ocorrências.
+def search_file(searcher, file_path, output=None, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    if output is None:
+        output = sys.stdout
+    file = sys.stdin if file_path == '-' else open(file_path, 'r', encoding='utf-8', newline='')
+    count = 0
+    block = []
+    try:
+        for end, pattern in search_stream(searcher, read_chunks(file, chunk_size), cache):
+            block.append(str(end) + '\t' + str(pattern) + '\n')
+            if len(block) >= WRITE_BLOCK:
+                output.write(''.join(block))
+                count += len(block)
+                block = []
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    output.write(''.join(block))
+    count += len(block)
+    output.flush()
+    return count
+
+
+def main(argv):
+    if len(argv) < 3:
+        print("Usage: python -m automatos.pesquisa <texto.txt|-> <padrao.er.json|padrao.afnd.json> [...] [-chunk <caracteres>] [-cache <estados>] [--stats|--stats=json]")
+        print("Escreve uma linha 'fim<TAB>padrão' por ocorrência: fim é a posição a seguir à ocorrência e padrão o número do arquivo do padrão (a começar em 0).")
+        sys.exit(1)
+
+    from automatos.estatisticas import count, enable_stats_from_argv, phase
+    enable_stats_from_argv(argv)
+
+    chunk_size = int(argv[argv.index('-chunk') + 1]) if '-chunk' in argv else DEFAULT_CHUNK_SIZE
+    cache = create_search_cache(int(argv[argv.index('-cache') + 1]) if '-cache' in argv else DEFAULT_CACHE_STATES)
+    options = {'-chunk', '-cache'}
+    pattern_files = [argument for index, argument in enumerate(argv[2:], 2)
+                     if not argument.startswith('-') and argv[index - 1] not in options]
+
+    patterns = []
+    with phase('json_load'):
+        for pattern_file in pattern_files:
+            with open(pattern_file, 'r') as file:
+                patterns.append(json.load(file))
+    with phase('compile_patterns'):
+        searcher = compile_patterns(patterns)
+    with phase('search'):
+        matches = search_file(searcher, argv[1], chunk_size=chunk_size, cache=cache)
+    count('matches', matches)
+    count('dfa_transitions_built', cache['misses'])
+    count('cache_flushes', cache['flushes'])
+
+
+if __name__ == '__main__':
+    main(sys.argv)
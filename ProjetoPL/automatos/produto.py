@@ -0,0 +1,176 @@
+from array import array
+from collections import deque
+
+from automatos.afd_compilado import NO_TRANSITION, compile_afd
+
+# Combinações de AFD compilados (interseção, união, complemento e diferença) por construção do produto.
+# O produto é preguiçoso: cada estado é um tuplo com um estado de cada AFD e só são construídos os estados
+# e as transições que as palavras lidas realmente percorrem, por isso uma só passagem pela palavra
+# responde à pergunta combinada. As combinações podem ser encadeadas:
+#
+#     query = difference(intersection(a, b), c)        # palavras de a e de b que não são de c
+#     accepts_product(query, 'abba')
+#     compiled = materialize(query, minimize=True)     # AFD completo (e mínimo), no formato compilado
+#
+# O alfabeto do produto é a união dos alfabetos. Num AFD que não conhece um símbolo, ler esse símbolo
+# leva ao estado morto (-1); um símbolo que nenhum dos AFD conhece faz a palavra ser rejeitada.
+
+# Valor usado na tabela do produto para as transições ainda não construídas
+NOT_BUILT = -2
+
+
+# Função para criar o produto preguiçoso dos AFD compilados operands; accept recebe um tuplo com a
+# aceitação de cada AFD e indica se o estado do produto é final
+def create_product(operands, accept):
+    columns = {}
+    for compiled in operands:
+        for symbol in compiled["columns"]:
+            columns.setdefault(symbol, len(columns))
+    # Coluna de cada símbolo do produto em cada AFD (-1 se o AFD não conhece o símbolo)
+    operand_columns = [[compiled["columns"].get(symbol, -1) for symbol in columns] for compiled in operands]
+    product = {
+        "operands": operands,
+        "operand_columns": operand_columns,
+        "accept": accept,
+        "columns": columns,
+        "n_symbols": len(columns),
+        "index": {},
+        "tuples": [],
+        "table": array('i'),
+        "accepting": [],
+    }
+    product["initial"] = _state_id(product, tuple(compiled["initial"] for compiled in operands))
+    return product
+
+
+# Função para obter o número de um estado do produto, criando-o se ainda não existir
+def _state_id(product, states):
+    state_id = product["index"].get(states)
+    if state_id is None:
+        state_id = len(product["tuples"])
+        product["index"][states] = state_id
+        product["tuples"].append(states)
+        product["table"].extend([NOT_BUILT] * product["n_symbols"])
+        accepted = tuple(state >= 0 and (compiled["finals"][state >> 3] >> (state & 7)) & 1 == 1
+                         for compiled, state in zip(product["operands"], states))
+        product["accepting"].append(bool(product["accept"](accepted)))
+    return state_id
+
+
+# Função para construir (e guardar na tabela) a transição de um estado do produto com a coluna dada
+def _build_transition(product, state_id, column):
+    states = []
+    for compiled, columns, state in zip(product["operands"], product["operand_columns"], product["tuples"][state_id]):
+        operand_column = columns[column]
+        if state < 0 or operand_column < 0:
+            states.append(-1)
+        else:
+            states.append(compiled["table"][state * compiled["n_symbols"] + operand_column])
+    next_id = _state_id(product, tuple(states))
+    product["table"][state_id * product["n_symbols"] + column] = next_id
+    return next_id
+
+
+# Função para obter os AFD e a função de aceitação de um operando (AFD compilado ou produto)
+def _operands(automaton):
+    if "operands" in automaton:
+        return automaton["operands"], automaton["accept"]
+    return [automaton], lambda accepted: accepted[0]
+
+
+# Função para combinar dois operandos com um operador booleano sobre as suas aceitações
+def _combine(left, right, operator):
+    left_operands, left_accept = _operands(left)
+    right_operands, right_accept = _operands(right)
+    split = len(left_operands)
+    return create_product(left_operands + right_operands,
+                          lambda accepted: operator(left_accept(accepted[:split]), right_accept(accepted[split:])))
+
+
+# Palavras aceites pelos dois autômatos
+def intersection(left, right):
+    return _combine(left, right, lambda a, b: a and b)
+
+
+# Palavras aceites por pelo menos um dos autômatos
+def union(left, right):
+    return _combine(left, right, lambda a, b: a or b)
+
+
+# Palavras aceites pelo primeiro autômato e não pelo segundo
+def difference(left, right):
+    return _combine(left, right, lambda a, b: a and not b)
+
+
+# Palavras (sobre o alfabeto do autômato) que o autômato não aceita
+def complement(automaton):
+    operands, accept = _operands(automaton)
+    return create_product(operands, lambda accepted: not accept(accepted))
+
+
+# Função para reconhecer uma palavra no produto, construindo as transições que ainda não existem
+def accepts_product(product, word):
+    columns = product["columns"]
+    table = product["table"]
+    n_symbols = product["n_symbols"]
+    state = product["initial"]
+    for symbol in word:
+        column = columns.get(symbol)
+        if column is None:
+            return False
+        next_state = table[state * n_symbols + column]
+        if next_state == NOT_BUILT:
+            next_state = _build_transition(product, state, column)
+        state = next_state
+    return product["accepting"][state]
+
+
+# Função para construir o produto completo (todos os estados alcançáveis) como AFD compilado.
+# O estado em que todos os AFD estão mortos, se não for final, é omitido (passa a NO_TRANSITION).
+# Com minimize=True, o AFD é minimizado (algoritmo de Hopcroft) antes de ser compilado.
+def materialize(product, minimize=False):
+    n_symbols = product["n_symbols"]
+    # Pesquisa em largura a partir do estado inicial; order tem os estados alcançáveis pela ordem da pesquisa
+    order = [product["initial"]]
+    seen = {product["initial"]}
+    queue = deque(order)
+    while queue:
+        state = queue.popleft()
+        for column in range(n_symbols):
+            next_state = product["table"][state * n_symbols + column]
+            if next_state == NOT_BUILT:
+                next_state = _build_transition(product, state, column)
+            if next_state not in seen:
+                seen.add(next_state)
+                order.append(next_state)
+                queue.append(next_state)
+
+    dead = product["index"].get(tuple(-1 for _ in product["operands"]))
+    if dead is not None and (product["accepting"][dead] or dead == product["initial"]):
+        dead = None
+    kept = [state for state in order if state != dead]
+    position = {state: index for index, state in enumerate(kept)}
+    position[dead] = NO_TRANSITION
+    alphabet = list(product["columns"])
+    delta = [[position[product["table"][state * n_symbols + column]] for column in range(n_symbols)] for state in kept]
+    finals = [index for index, state in enumerate(kept) if product["accepting"][state]]
+
+    if minimize:
+        from automatos.afd_minimizacao import minimize as minimize_afd
+        return compile_afd(minimize_afd({'alphabet': alphabet, 'delta': delta, 'finals': finals}))
+
+    names = [_tuple_name(product, product["tuples"][state]) for state in kept]
+    return compile_afd({
+        "V": alphabet,
+        "Q": names,
+        "delta": {names[index]: {alphabet[column]: names[target] for column, target in enumerate(row) if target >= 0}
+                  for index, row in enumerate(delta)},
+        "q0": names[0],
+        "F": [names[index] for index in finals],
+    })
+
+
+# Função para obter o nome de um estado do produto a partir dos nomes dos estados dos AFD ('-' para o estado morto)
+def _tuple_name(product, states):
+    return '(' + ','.join('-' if state < 0 else str(compiled["states"][state])
+                          for compiled, state in zip(product["operands"], states)) + ')'
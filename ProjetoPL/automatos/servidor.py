@@ -0,0 +1,265 @@
+import asyncio
+import hashlib
+import json
+import os
+import sys
+
+from automatos.afd import load_afd_from_json, validate_afd_definition
+from automatos.afd_compilado import accepts, compile_afd, recognize_compiled
+from automatos.cache import cache_key
+
+# Servidor de reconhecimento: mantém os AFD compilados em memória e responde a pedidos em JSON,
+# um por linha (NDJSON), numa ligação TCP ou num socket Unix. Exemplo de pedidos:
+#
+#     {"id": 1, "op": "load", "name": "af", "path": "PartA/af.json"}
+#     {"id": 2, "op": "recognize", "name": "af", "words": ["ab", "ba"]}
+#     {"id": 3, "op": "recognize", "name": "af", "words": ["ba"], "reason": true}
+#
+# Cada resposta é uma linha JSON com "ok" e o "id" do pedido. Os pedidos de uma ligação são respondidos
+# pela ordem em que chegam, por isso o cliente pode enviar vários sem esperar pelas respostas.
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 7878
+
+# Intervalo (em segundos) entre verificações dos arquivos dos autômatos carregados
+DEFAULT_RELOAD_INTERVAL = 1.0
+
+# Tamanho máximo de uma linha (pedido) recebida
+LINE_LIMIT = 64 * 1024 * 1024
+
+
+# Função para ler e compilar um autômato de um arquivo (.json ou .afdb).
+# Devolve o hash do conteúdo e a função que compila o autômato (chamada só se o hash for novo).
+def _read_automaton(path):
+    if path.endswith('.afdb'):
+        from automatos.binario import load_binary
+        with open(path, 'rb') as file:
+            content_hash = 'afdb-' + hashlib.sha256(file.read()).hexdigest()
+        return content_hash, lambda: load_binary(path)
+    afd_definition = load_afd_from_json(path)
+    return _definition_automaton(afd_definition)
+
+
+# Função para validar a definição de um autômato e devolver o hash do conteúdo e a função que o compila
+def _definition_automaton(afd_definition):
+    validate_afd_definition(afd_definition)
+    return cache_key('afd', afd_definition), lambda: compile_afd(afd_definition)
+
+
+# Estado de um arquivo, usado para detetar alterações (data de modificação e tamanho)
+def _file_signature(path):
+    info = os.stat(path)
+    return info.st_mtime_ns, info.st_size
+
+
+# Registo dos autômatos compilados, indexados pelo nome e pelo hash do conteúdo.
+# Nomes com o mesmo conteúdo partilham o mesmo AFD compilado.
+class Registry:
+    def __init__(self):
+        self.entries = {}
+        self.by_hash = {}
+
+    # Regista (ou substitui) o autômato com o nome dado; devolve a entrada do registo
+    def register(self, name, content_hash, build, path=None, signature=None):
+        compiled = self.by_hash.get(content_hash)
+        if compiled is None:
+            compiled = build()
+        previous = self.entries.get(name)
+        self.entries[name] = {
+            'name': name,
+            'hash': content_hash,
+            'compiled': compiled,
+            'path': path,
+            'signature': signature,
+        }
+        self.by_hash[content_hash] = compiled
+        if previous is not None:
+            self._release(previous['hash'])
+        return self.entries[name]
+
+    # Carrega o autômato de um arquivo
+    def load_file(self, name, path):
+        signature = _file_signature(path)
+        content_hash, build = _read_automaton(path)
+        return self.register(name, content_hash, build, path, signature)
+
+    # Carrega o autômato a partir da definição JSON recebida no pedido
+    def load_definition(self, name, afd_definition):
+        content_hash, build = _definition_automaton(afd_definition)
+        return self.register(name, content_hash, build)
+
+    # Remove o autômato com o nome dado
+    def unload(self, name):
+        entry = self.get(name)
+        del self.entries[name]
+        self._release(entry['hash'])
+
+    # Descarta o AFD compilado quando nenhum nome usa o conteúdo com este hash
+    def _release(self, content_hash):
+        if all(entry['hash'] != content_hash for entry in self.entries.values()):
+            self.by_hash.pop(content_hash, None)
+
+    def get(self, name):
+        entry = self.entries.get(name)
+        if entry is None:
+            raise ValueError("o autômato '" + name + "' não está carregado")
+        return entry
+
+    # Recarrega os autômatos cujo arquivo mudou desde que foram carregados.
+    # Se o novo conteúdo for inválido, a versão anterior continua em uso.
+    def reload_changed(self):
+        reloaded = []
+        for name, entry in list(self.entries.items()):
+            if entry['path'] is None:
+                continue
+            try:
+                if _file_signature(entry['path']) == entry['signature']:
+                    continue
+                self.load_file(name, entry['path'])
+                reloaded.append(name)
+            except Exception as error:
+                # Qualquer erro (arquivo ilegível, JSON inválido ou com a estrutura errada) só afeta este autômato
+                print("Erro ao recarregar '" + name + "': " + str(error), file=sys.stderr)
+                # Evita repetir o erro enquanto o arquivo não voltar a mudar
+                try:
+                    entry['signature'] = _file_signature(entry['path'])
+                except OSError:
+                    pass
+        return reloaded
+
+
+# Função para descrever uma entrada do registo numa resposta
+def _describe(entry):
+    return {
+        'name': entry['name'],
+        'hash': entry['hash'],
+        'states': len(entry['compiled']['states']),
+        'path': entry['path'],
+    }
+
+
+# Função para responder a um pedido; devolve o dicionário da resposta
+def handle_request(registry, request):
+    op = request.get('op')
+    if op == 'recognize':
+        compiled = registry.get(request['name'])['compiled']
+        words = request['words']
+        if request.get('reason'):
+            results = []
+            reasons = []
+            for word in words:
+                recognized, path = recognize_compiled(compiled, word, trace=False)
+                results.append(recognized)
+                reasons.append(None if recognized else path)
+            return {'ok': True, 'results': results, 'reasons': reasons}
+        return {'ok': True, 'results': [accepts(compiled, word) for word in words]}
+    if op == 'load':
+        if 'path' in request:
+            entry = registry.load_file(request['name'], request['path'])
+        else:
+            entry = registry.load_definition(request['name'], request['afd'])
+        return dict(_describe(entry), ok=True)
+    if op == 'unload':
+        registry.unload(request['name'])
+        return {'ok': True}
+    if op == 'list':
+        return {'ok': True, 'automata': [_describe(entry) for entry in registry.entries.values()]}
+    raise ValueError("operação desconhecida: " + repr(op))
+
+
+# Função para tratar uma ligação: lê os pedidos, um por linha, e escreve as respostas pela mesma ordem
+async def _serve_connection(registry, reader, writer):
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                response = {'ok': False, 'error': 'pedido demasiado grande'}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get('id')
+                response = handle_request(registry, request)
+            except KeyError as error:
+                response = {'ok': False, 'error': 'falta o campo ' + str(error)}
+            except (ValueError, TypeError, AttributeError, OSError) as error:
+                response = {'ok': False, 'error': str(error)}
+            if request_id is not None:
+                response['id'] = request_id
+            writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+            # Só espera pelo envio quando o buffer de saída está cheio; os pedidos seguintes já podem ser tratados
+            if writer.transport.get_write_buffer_size() > LINE_LIMIT:
+                await writer.drain()
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+# Tarefa que verifica periodicamente se os arquivos dos autômatos carregados mudaram
+async def _watch_files(registry, interval):
+    while True:
+        await asyncio.sleep(interval)
+        # Um erro inesperado é indicado mas não termina a tarefa: a verificação continua na volta seguinte
+        try:
+            for name in registry.reload_changed():
+                print("Autômato '" + name + "' recarregado", file=sys.stderr)
+        except Exception as error:
+            print("Erro ao verificar os arquivos dos autômatos: " + str(error), file=sys.stderr)
+
+
+# Função para iniciar o servidor (TCP, ou socket Unix se unix_path for dado) e atender pedidos até ser interrompido
+async def serve(registry, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None, reload_interval=DEFAULT_RELOAD_INTERVAL):
+    def handler(reader, writer):
+        return _serve_connection(registry, reader, writer)
+
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(handler, path=unix_path, limit=LINE_LIMIT)
+        print("Servidor à escuta em " + unix_path, file=sys.stderr)
+    else:
+        server = await asyncio.start_server(handler, host, port, limit=LINE_LIMIT)
+        print("Servidor à escuta em " + host + ":" + str(port), file=sys.stderr)
+
+    watcher = asyncio.create_task(_watch_files(registry, reload_interval)) if reload_interval > 0 else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+
+
+def main(argv):
+    if '-h' in argv or '--help' in argv:
+        print("Usage: python -m automatos.servidor [-host <endereço>] [-port <porta>] [-unix <caminho>] [-load <nome>=<arquivo.json|arquivo.afdb> ...] [-reload <segundos>]")
+        sys.exit(0)
+
+    host = argv[argv.index('-host') + 1] if '-host' in argv else DEFAULT_HOST
+    port = int(argv[argv.index('-port') + 1]) if '-port' in argv else DEFAULT_PORT
+    unix_path = argv[argv.index('-unix') + 1] if '-unix' in argv else None
+    reload_interval = float(argv[argv.index('-reload') + 1]) if '-reload' in argv else DEFAULT_RELOAD_INTERVAL
+
+    # Carrega os autômatos indicados com -load (a opção pode ser repetida)
+    registry = Registry()
+    for index, argument in enumerate(argv):
+        if argument == '-load':
+            name, _, path = argv[index + 1].partition('=')
+            if not path:
+                name, path = os.path.splitext(os.path.basename(name))[0], name
+            registry.load_file(name, path)
+
+    try:
+        asyncio.run(serve(registry, host, port, unix_path, reload_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main(sys.argv)
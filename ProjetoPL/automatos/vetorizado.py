@@ -0,0 +1,129 @@
+import sys
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("O reconhecimento vetorizado precisa do NumPy (pip install numpy).") from error
+
+from automatos.afd_compilado import recognize_compiled
+from automatos.afd_lote import format_result, read_words
+
+# Reconhecimento de muitas palavras de uma vez: as palavras são codificadas numa matriz de colunas da tabela
+# e todas avançam um símbolo em cada passo, com indexação avançada do NumPy.
+
+# Número de palavras codificadas e reconhecidas de cada vez por recognize_file_vectorized
+DEFAULT_BATCH_SIZE = 65536
+
+
+# Função para construir a tabela alargada usada no reconhecimento vetorizado, a partir do AFD compilado.
+# Relativamente a compiled["table"], a tabela tem:
+#   - uma linha extra para o estado morto, que substitui as transições não definidas e não sai de si mesmo;
+#   - uma coluna extra para os símbolos fora do alfabeto, que leva sempre ao estado morto;
+#   - uma coluna extra de enchimento, que mantém o estado (usada depois do fim das palavras mais curtas).
+def vectorize(compiled):
+    n_states = len(compiled["states"])
+    n_symbols = compiled["n_symbols"]
+    dead = n_states
+    unknown = n_symbols
+    pad = n_symbols + 1
+    width = n_symbols + 2
+
+    table = np.full((n_states + 1, width), dead, dtype=np.intp)
+    transitions = np.asarray(compiled["table"], dtype=np.intp).reshape(n_states, n_symbols)
+    table[:n_states, :n_symbols] = np.where(transitions < 0, dead, transitions)
+    table[:, pad] = np.arange(n_states + 1)
+
+    finals = np.zeros(n_states + 1, dtype=bool)
+    finals[:n_states] = np.unpackbits(np.frombuffer(compiled["finals"], dtype=np.uint8),
+                                      count=n_states, bitorder="little").astype(bool)
+
+    # Tabela de conversão de caractere (código Unicode) para coluna; os símbolos com mais de um
+    # caractere nunca aparecem numa palavra, que é percorrida caractere a caractere
+    single = {symbol: column for symbol, column in compiled["columns"].items() if len(symbol) == 1}
+    lookup = np.full(max((ord(symbol) for symbol in single), default=0) + 1, unknown, dtype=np.int32)
+    for symbol, column in single.items():
+        lookup[ord(symbol)] = column
+
+    return {
+        "table": table.ravel(),
+        "width": width,
+        "finals": finals,
+        "lookup": lookup,
+        "initial": compiled["initial"],
+        "unknown": unknown,
+        "pad": pad,
+    }
+
+
+# Função para codificar as palavras numa matriz com um passo por linha e uma palavra por coluna
+# (cada passo lê uma linha contígua). As palavras mais curtas são completadas com a coluna de enchimento.
+def encode_words(vectorized, words):
+    lengths = np.fromiter((len(word) for word in words), dtype=np.intp, count=len(words))
+    max_length = int(lengths.max()) if len(words) else 0
+    steps = np.full((max_length, len(words)), vectorized["pad"], dtype=np.int32)
+    if max_length == 0:
+        return steps, lengths
+
+    # Todas as palavras são convertidas numa única operação: os códigos dos caracteres da concatenação
+    codes = np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32)
+    lookup = vectorized["lookup"]
+    symbols = np.where(codes < len(lookup), lookup[np.minimum(codes, len(lookup) - 1)], vectorized["unknown"])
+
+    if lengths.min() == max_length:
+        # Palavras todas com o mesmo comprimento: basta reorganizar a concatenação
+        steps[:] = symbols.reshape(len(words), max_length).T
+    else:
+        # Posição (passo, palavra) de cada caractere da concatenação
+        word_index = np.repeat(np.arange(len(words)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        steps[np.arange(len(symbols)) - starts, word_index] = symbols
+    return steps, lengths
+
+
+# Função para reconhecer um lote de palavras; devolve um array de booleanos (True se a palavra é aceite)
+def accepts_batch(vectorized, words):
+    steps, _ = encode_words(vectorized, words)
+    table = vectorized["table"]
+    width = vectorized["width"]
+    states = np.full(len(words), vectorized["initial"], dtype=np.intp)
+    for step in steps:
+        states = table[states * width + step]
+    return vectorized["finals"][states]
+
+
+# Função para reconhecer as palavras de um arquivo (ou da entrada padrão, se o caminho for '-') em lotes,
+# com a mesma saída de afd_lote.recognize_file. Com with_reason=True, os motivos das palavras rejeitadas
+# são obtidos com recognize_compiled (só para essas palavras).
+def recognize_file_vectorized(compiled, file_path, output=None, with_reason=False, batch_size=DEFAULT_BATCH_SIZE):
+    if output is None:
+        output = sys.stdout
+    vectorized = vectorize(compiled)
+    count = 0
+    file = sys.stdin if file_path == "-" else open(file_path, "r", encoding="utf-8")
+    try:
+        batch = []
+        for word in read_words(file):
+            batch.append(word)
+            if len(batch) >= batch_size:
+                count += _write_batch(compiled, vectorized, batch, output, with_reason)
+                batch = []
+        if batch:
+            count += _write_batch(compiled, vectorized, batch, output, with_reason)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+    output.flush()
+    return count
+
+
+# Função para reconhecer um lote de palavras e escrever os resultados
+def _write_batch(compiled, vectorized, words, output, with_reason):
+    accepted = accepts_batch(vectorized, words).tolist()
+    if with_reason:
+        lines = [format_result(word, True) if recognized
+                 else format_result(word, False, recognize_compiled(compiled, word, trace=False)[1])
+                 for word, recognized in zip(words, accepted)]
+    else:
+        lines = [format_result(word, recognized) for word, recognized in zip(words, accepted)]
+    output.write("".join(lines))
+    return len(words)
@@ -0,0 +1,247 @@
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Permite importar o pacote automatos, que está na pasta acima desta
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, BASE_DIR)
+
+from automatos.afd_compilado import accepts, compile_afd
+from automatos.afd_lote import recognize_file
+from automatos.afnd_otimizacao import otimizaAFND
+from automatos.er_compilador import convertERParaAFND
+from automatos.afnd_determinizacao import afd_from_subsets, convert_afnd_to_afd, index_afnd
+from automatos.afnd_paralelo import determinize_parallel
+from automatos.afd_minimizacao import compact_from_afd, minimize
+from automatos.afnd_simulacao import accepts_afnd, compile_afnd, create_lazy_cache
+from geradores import (deep_er, pathological_afnd, random_afd, random_afnd, random_er,
+                       random_words, write_corpus)
+
+# Tamanhos usados por cada etapa, em cada perfil
+SIZES = {
+    'small': {
+        'recognize': [1000, 10000, 100000],
+        'recognize_vector': [1000, 10000, 100000],
+        'batch': [10000, 100000],
+        'er_to_nfa': [1000, 10000, 100000],
+        'er_deep': [1000, 10000],
+        'optimize_nfa': [100, 1000, 10000],
+        'determinize_random': [20, 40, 60],
+        'determinize_pathological': [6, 9, 12],
+        'determinize_parallel': [6, 9, 12],
+        'minimize': [100, 1000, 10000],
+        'simulate_nfa': [8, 16, 32],
+    },
+    'large': {
+        'recognize': [100000, 1000000, 10000000],
+        'recognize_vector': [100000, 1000000, 10000000],
+        'batch': [1000000, 10000000],
+        'er_to_nfa': [10000, 100000, 1000000],
+        'er_deep': [10000, 100000, 500000],
+        'optimize_nfa': [1000, 10000, 100000],
+        'determinize_random': [60, 80, 100],
+        'determinize_pathological': [10, 13, 16],
+        'determinize_parallel': [10, 13, 16],
+        'minimize': [1000, 10000, 100000],
+        'simulate_nfa': [16, 64, 256],
+    },
+}
+
+
+# Cada etapa recebe o tamanho e a semente e devolve uma função sem argumentos que executa o trabalho medido
+# (a preparação dos dados não entra na medição).
+
+def stage_recognize(size, seed):
+    compiled = compile_afd(random_afd(100, 4, seed))
+    words = list(random_words(['a', 'b', 'c', 'd'], size, seed))
+    return lambda: sum(1 for word in words if accepts(compiled, word))
+
+
+# Etapa opcional: precisa do NumPy (sem ele, stage_recognize_vector levanta ImportError e a etapa é ignorada)
+def stage_recognize_vector(size, seed):
+    from automatos.vetorizado import accepts_batch, vectorize
+    vectorized = vectorize(compile_afd(random_afd(100, 4, seed)))
+    words = list(random_words(['a', 'b', 'c', 'd'], size, seed))
+    return lambda: int(accepts_batch(vectorized, words).sum())
+
+
+def stage_batch(size, seed):
+    compiled = compile_afd(random_afd(100, 4, seed))
+    descriptor, corpus = tempfile.mkstemp(suffix='.txt')
+    os.close(descriptor)
+    write_corpus(corpus, ['a', 'b', 'c', 'd'], size, seed)
+
+    def run():
+        with open(os.devnull, 'w') as output:
+            recognize_file(compiled, corpus, output)
+    run.cleanup = lambda: os.remove(corpus)
+    return run
+
+
+def stage_er_to_nfa(size, seed):
+    er = random_er(size, 4, seed)
+    return lambda: convertERParaAFND(er)
+
+
+def stage_er_deep(size, seed):
+    er = deep_er(size)
+    return lambda: convertERParaAFND(er)
+
+
+def stage_optimize_nfa(size, seed):
+    afnd = convertERParaAFND(random_er(size, 4, seed))
+    return lambda: otimizaAFND(afnd)
+
+
+def stage_determinize_random(size, seed):
+    afnd = random_afnd(size, 2, seed)
+    return lambda: convert_afnd_to_afd(afnd)
+
+
+def stage_determinize_pathological(size, seed):
+    afnd = pathological_afnd(size)
+    return lambda: convert_afnd_to_afd(afnd)
+
+
+# Mesmo trabalho que determinize_pathological, com a construção de subconjuntos repartida por todos os processadores
+def stage_determinize_parallel(size, seed):
+    afnd = pathological_afnd(size)
+
+    def run():
+        indexed = index_afnd(afnd)
+        return afd_from_subsets(indexed, determinize_parallel(indexed))
+    return run
+
+
+def stage_minimize(size, seed):
+    afd = compact_from_afd(random_afd(size, 2, seed))
+    return lambda: minimize(afd)
+
+
+def stage_simulate_nfa(size, seed):
+    compiled = compile_afnd(pathological_afnd(size))
+    words = list(random_words(['a', 'b'], 2000, seed, size, 4 * size))
+
+    def run():
+        cache = create_lazy_cache()
+        return sum(1 for word in words if accepts_afnd(compiled, word, cache))
+    return run
+
+
+STAGES = {
+    'recognize': stage_recognize,
+    'recognize_vector': stage_recognize_vector,
+    'batch': stage_batch,
+    'er_to_nfa': stage_er_to_nfa,
+    'er_deep': stage_er_deep,
+    'optimize_nfa': stage_optimize_nfa,
+    'determinize_random': stage_determinize_random,
+    'determinize_pathological': stage_determinize_pathological,
+    'determinize_parallel': stage_determinize_parallel,
+    'minimize': stage_minimize,
+    'simulate_nfa': stage_simulate_nfa,
+}
+
+
+# Função para medir uma execução: o tempo é medido sem tracemalloc e o pico de memória numa segunda execução
+def measure(run, repeat):
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
+
+
+# Função para obter a versão atual do código (commit do git), para comparar resultados entre versões
+def code_version():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Função para executar as etapas pedidas e devolver os resultados
+def run_benchmarks(stages, profile, seed, repeat):
+    results = []
+    for name in stages:
+        for size in SIZES[profile][name]:
+            try:
+                run = STAGES[name](size, seed)
+            except ImportError as error:
+                print("{:<26} ignorada: {}".format(name, error), file=sys.stderr)
+                break
+            try:
+                seconds, peak = measure(run, repeat)
+            finally:
+                if hasattr(run, 'cleanup'):
+                    run.cleanup()
+            print("{:<26} {:>10} {:>10.4f} s {:>10.1f} MiB".format(name, size, seconds, peak / 2 ** 20), file=sys.stderr)
+            results.append({'stage': name, 'size': size, 'seconds': seconds, 'peak_bytes': peak})
+    return {
+        'version': code_version(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'profile': profile,
+        'seed': seed,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+# Função para comparar os resultados com os de uma execução anterior (razão entre os tempos e os picos de memória)
+def compare_reports(previous, current):
+    before = {(result['stage'], result['size']): result for result in previous['results']}
+    for result in current['results']:
+        old = before.get((result['stage'], result['size']))
+        if old is None or not old['seconds']:
+            continue
+        memory_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else float('nan')
+        print("{:<26} {:>10} tempo x{:.2f} memória x{:.2f}".format(
+            result['stage'], result['size'], result['seconds'] / old['seconds'], memory_ratio), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    if '-h' in sys.argv or '--help' in sys.argv:
+        print("Utilização: python bench_main.py [-profile small|large] [-stage <etapa>]... [-seed <n>] [-repeat <n>] [-output <resultados.json>] [-compare <anteriores.json>]")
+        print("Etapas: " + ', '.join(STAGES))
+        sys.exit()
+
+    def option(name, default):
+        return sys.argv[sys.argv.index(name) + 1] if name in sys.argv else default
+
+    profile = option('-profile', 'small')
+    if profile not in SIZES:
+        print("Erro: Perfil inválido. Use 'small' ou 'large'.")
+        sys.exit(1)
+    stages = [sys.argv[index + 1] for index, argument in enumerate(sys.argv) if argument == '-stage'] or list(STAGES)
+    for name in stages:
+        if name not in STAGES:
+            print("Erro: Etapa desconhecida '" + name + "'.")
+            sys.exit(1)
+
+    report = run_benchmarks(stages, profile, int(option('-seed', '42')), int(option('-repeat', '3')))
+    if '-compare' in sys.argv:
+        with open(option('-compare', None)) as file:
+            compare_reports(json.load(file), report)
+    output = option('-output', None)
+    if output:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=4)
+        print("Resultados escritos em", output, file=sys.stderr)
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        print()
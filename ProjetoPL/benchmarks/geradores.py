@@ -0,0 +1,93 @@
+import random
+
+# Geradores (determinísticos, a partir de uma semente) de autômatos, expressões regulares e palavras
+# usados pelos benchmarks. Todos devolvem os mesmos formatos JSON usados pelas partes A, B e C.
+
+
+# Função para gerar o alfabeto com os primeiros n símbolos ('a', 'b', ...)
+def make_alphabet(size):
+    return [chr(ord('a') + index) for index in range(size)]
+
+
+# Função para gerar um AFD aleatório no formato da PartA, com a fração density das transições definida
+def random_afd(n_states, alphabet_size, seed, density=0.9, final_ratio=0.3):
+    rng = random.Random(seed)
+    alphabet = make_alphabet(alphabet_size)
+    states = ['q' + str(index) for index in range(n_states)]
+    delta = {}
+    for state in states:
+        delta[state] = {symbol: rng.choice(states) for symbol in alphabet if rng.random() < density}
+    finals = [state for state in states if rng.random() < final_ratio] or [states[-1]]
+    return {"V": alphabet, "Q": states, "delta": delta, "q0": states[0], "F": finals}
+
+
+# Função para gerar um AFND aleatório no formato da PartC (e da PartB: as transições vazias usam '')
+def random_afnd(n_states, alphabet_size, seed, fanout=2, epsilon_ratio=0.1, final_ratio=0.1):
+    rng = random.Random(seed)
+    alphabet = make_alphabet(alphabet_size)
+    states = ['q' + str(index) for index in range(n_states)]
+    delta = {}
+    for state in states:
+        transitions = {}
+        for symbol in alphabet:
+            if rng.random() < 0.7:
+                transitions[symbol] = rng.sample(states, min(fanout, n_states))
+        if rng.random() < epsilon_ratio:
+            transitions[''] = [rng.choice(states)]
+        delta[state] = transitions
+    finals = [state for state in states if rng.random() < final_ratio] or [states[-1]]
+    return {"V": alphabet, "Q": states, "delta": delta, "q0": states[0], "F": finals}
+
+
+# Função para gerar o AFND de (a|b)*a(a|b)^n, cujo AFD equivalente tem 2^(n+1) estados
+def pathological_afnd(n):
+    states = ['q' + str(index) for index in range(n + 2)]
+    delta = {state: {} for state in states}
+    delta['q0'] = {'a': ['q0', 'q1'], 'b': ['q0']}
+    for index in range(1, n + 1):
+        delta['q' + str(index)] = {'a': ['q' + str(index + 1)], 'b': ['q' + str(index + 1)]}
+    return {"V": ['a', 'b'], "Q": states, "delta": delta, "q0": 'q0', "F": [states[-1]]}
+
+
+# Função para gerar uma expressão regular aleatória (formato da PartB) com cerca de n_nodes nós.
+# A árvore é construída sem recursão, para poder ser muito profunda.
+def random_er(n_nodes, alphabet_size, seed, max_args=3):
+    rng = random.Random(seed)
+    alphabet = make_alphabet(alphabet_size)
+    root = {}
+    pending = [(root, n_nodes)]
+    while pending:
+        node, budget = pending.pop()
+        if budget <= 1:
+            node['simb'] = rng.choice(alphabet)
+            continue
+        operator = rng.choice(['alt', 'seq', 'kle', 'trans'])
+        n_args = 1 if operator == 'kle' else min(rng.randint(1, max_args), budget - 1)
+        node['op'] = operator
+        node['args'] = [{} for _ in range(n_args)]
+        share = (budget - 1) // n_args
+        for child in node['args']:
+            pending.append((child, max(share, 1)))
+    return root
+
+
+# Função para gerar uma expressão regular com n fechos de Kleene encaixados (profundidade n)
+def deep_er(depth, symbol='a'):
+    er = {'simb': symbol}
+    for _ in range(depth):
+        er = {'op': 'kle', 'args': [er]}
+    return er
+
+
+# Função para gerar palavras aleatórias sobre um alfabeto, com comprimento entre min_length e max_length
+def random_words(alphabet, count, seed, min_length=0, max_length=16):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(alphabet) for _ in range(rng.randint(min_length, max_length)))
+
+
+# Função para escrever um corpus de palavras (uma por linha) num arquivo
+def write_corpus(file_path, alphabet, count, seed, min_length=0, max_length=16):
+    with open(file_path, 'w', encoding='utf-8') as file:
+        for word in random_words(alphabet, count, seed, min_length, max_length):
+            file.write(word + '\n')